@@ -1,6 +1,14 @@
+import heapq
+import multiprocessing
+from array import array
 from collections import defaultdict
 from copy import deepcopy
 
+INF = float('inf')
+
+# Node states used by the iterative solver
+NEW, OPEN, SOLVED = 0, 1, 2
+
 def aostar(graph, heuristic, start="S"):
     solved = defaultdict(bool)
     cost = deepcopy(heuristic)
@@ -74,6 +82,542 @@ def aostar(graph, heuristic, start="S"):
     path = reconstruct_path(start)
     return cost[start], path  # Return both the cost and the path
 
+class AndOrGraph:
+    """AND-OR graph with integer node ids, stored in flat arrays.
+
+    Node ``u`` has the OR alternatives (groups) ``group_offsets[u]`` up to
+    ``group_offsets[u + 1]``. Group ``j`` needs all of the AND children
+    ``children[child_offsets[j]:child_offsets[j + 1]]``, reached at the
+    matching ``edge_costs``. A node without groups is a leaf whose cost is
+    its heuristic.
+    """
+
+    def __init__(self, names, heuristics, group_offsets, child_offsets, children, edge_costs):
+        self.names = names
+        self.heuristics = heuristics
+        self.group_offsets = group_offsets
+        self.child_offsets = child_offsets
+        self.children = children
+        self.edge_costs = edge_costs
+        self._index = None
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = {name: i for i, name in enumerate(self.names)}
+        return self._index
+
+    @property
+    def num_nodes(self):
+        return len(self.names)
+
+    def groups(self, u):
+        return range(self.group_offsets[u], self.group_offsets[u + 1])
+
+    def group_children(self, group):
+        start, end = self.child_offsets[group], self.child_offsets[group + 1]
+        return zip(self.children[start:end], self.edge_costs[start:end])
+
+    def group_cost(self, group, cost):
+        return sum(edge_cost + cost[child] for child, edge_cost in self.group_children(group))
+
+    @classmethod
+    def from_dict(cls, graph, heuristic):
+        """Build from the ``{node: [[(child, edge_cost), ...], ...]}`` form used by ``aostar``.
+
+        Nodes missing from ``heuristic`` get a heuristic of 0.
+        """
+        index = {}
+        names = []
+
+        def node_id(name):
+            if name not in index:
+                index[name] = len(names)
+                names.append(name)
+            return index[name]
+
+        for name in graph:
+            node_id(name)
+        for groups in graph.values():
+            for group in groups:
+                for child, _ in group:
+                    node_id(child)
+        for name in heuristic:
+            node_id(name)
+
+        group_offsets = array('q', [0]) * (len(names) + 1)
+        child_offsets = array('q', [0])
+        children = array('i')
+        edge_costs = array('d')
+        for u, name in enumerate(names):
+            for group in graph.get(name, ()):
+                for child, edge_cost in group:
+                    children.append(index[child])
+                    edge_costs.append(edge_cost)
+                child_offsets.append(len(children))
+            group_offsets[u + 1] = len(child_offsets) - 1
+        heuristics = array('d', (heuristic.get(name, 0) for name in names))
+        graph = cls(names, heuristics, group_offsets, child_offsets, children, edge_costs)
+        graph._index = index
+        return graph
+
+class AOStarSolver:
+    """Persistent AO* over an AndOrGraph that re-solves incrementally.
+
+    Explores like ``aostar`` with an explicit stack, so any depth is safe,
+    and costs nodes on a cycle by their cheapest acyclic solution.
+    ``prune=True`` skips OR alternatives that cannot beat the best group
+    (non-negative costs only). ``presolved`` seeds ``solved_nodes()``
+    tuples from other solvers, see ``solve_parallel``.
+    """
+
+    def __init__(self, graph, start, prune=False, presolved=()):
+        self.graph = graph
+        self.start = start
+        self.prune = prune
+        self._reset()
+        for u, cost, best, group_costs, root in presolved:
+            if self.state[u] != NEW:
+                continue
+            self.cost[u] = cost
+            self.best_group[u] = best
+            for group, group_cost in zip(self.graph.groups(u), group_costs):
+                if group_cost is None:
+                    self.cyclic[group] = 1
+                else:
+                    self.group_cost[group] = group_cost
+            self._finish(u, root)
+            if root != u:
+                # A component's root is always solved first
+                self.components.setdefault(root, [root]).append(u)
+        self._solve()
+
+    def _reset(self):
+        graph = self.graph
+        n = graph.num_nodes
+        num_groups = len(graph.child_offsets) - 1
+        self.cost = array('d', graph.heuristics)
+        self.best_group = array('q', [-1]) * n
+        self.group_cost = array('d', [INF]) * num_groups
+        self.cyclic = bytearray(num_groups)  # groups that need their own node, never usable
+        self.state = bytearray(n)
+        self.order = array('q', [-1]) * n  # position in which each node was solved
+        self.component = array('q', [-1]) * n  # root of each node's strongly connected component
+        self.components = {}  # root -> members, for components of more than one node
+        self.pruned = 0
+        self._solved = 0
+        self._group_owner = None
+        self._parent_offsets = None
+        self._parent_groups = None
+        self._dirty_groups = set()
+        self._dirty_nodes = set()
+
+    def _finish(self, u, root=None):
+        self.state[u] = SOLVED
+        self.order[u] = self._solved
+        self.component[u] = u if root is None else root
+        self._solved += 1
+
+    def _solve_component(self, members):
+        """Costs of the nodes of one cycle, given final costs for everything below it.
+
+        ``_solve`` leaves nodes on a cycle open until their whole strongly
+        connected component is explored and then settles them here, so a
+        cost does not depend on where the search entered the cycle. Knuth's generalisation of Dijkstra: a group becomes usable once all
+        of its children inside the component are settled, and the cheapest
+        usable group settles its node. Every solution found this way is
+        acyclic, and the result does not depend on the order the nodes
+        were reached in. Needs non-negative edge costs and heuristics.
+        """
+        graph, cost, state = self.graph, self.cost, self.state
+        inside = set(members)
+        owner = {}
+        pending = {}
+        waiting = {}
+        ready = []
+        for u in members:
+            cost[u] = INF
+            self.best_group[u] = -1
+            for group in graph.groups(u):
+                self.cyclic[group] = 0
+                self.group_cost[group] = INF
+                count = 0
+                usable = True
+                for child, _ in graph.group_children(group):
+                    if child in inside:
+                        count += 1
+                        waiting.setdefault(child, []).append(group)
+                    elif state[child] != SOLVED:
+                        usable = False  # pruned before this child was explored
+                if not usable:
+                    continue
+                owner[group] = u
+                if count:
+                    pending[group] = count
+                else:
+                    self.group_cost[group] = graph.group_cost(group, cost)
+                    heapq.heappush(ready, (self.group_cost[group], group))
+
+        settled = set()
+        while ready:
+            group_cost, group = heapq.heappop(ready)
+            u = owner[group]
+            if u in settled:
+                continue
+            settled.add(u)
+            cost[u] = group_cost
+            self.best_group[u] = group
+            for parent in waiting.get(u, ()):
+                if parent in pending:
+                    pending[parent] -= 1
+                    if not pending[parent]:
+                        self.group_cost[parent] = graph.group_cost(parent, cost)
+                        heapq.heappush(ready, (self.group_cost[parent], parent))
+
+    def _close_component(self, u, frame):
+        """Finish the component whose root ``u`` has just left the stack."""
+        members = []
+        while True:
+            v = self._tarjan.pop()
+            members.append(v)
+            if v == u:
+                break
+        if len(members) == 1:
+            # Only groups through u itself were left open, and those can never be used
+            if frame[6] >= 0:
+                self.cost[u] = frame[5]
+                self.best_group[u] = frame[6]
+            else:
+                self.cost[u] = INF
+            self._finish(u)
+            return
+        members.reverse()
+        self._solve_component(members)
+        self.components[u] = members
+        for v in members:
+            self._finish(v, u)
+
+    def _solve(self):
+        graph, cost, state = self.graph, self.cost, self.state
+        group_offsets, children, edge_costs = graph.group_offsets, graph.children, graph.edge_costs
+        prune = self.prune
+        index = {}
+        low = {}
+        self._tarjan = []
+
+        def expand(u):
+            # Explore the cheapest-looking groups first, as aostar does
+            state[u] = OPEN
+            index[u] = low[u] = len(index)
+            self._tarjan.append(u)
+            groups = sorted(graph.groups(u), key=lambda j: graph.group_cost(j, cost))
+            # node, groups, group position, child position, partial cost, min, best, open children
+            return [u, groups, 0, 0, 0, INF, -1, False]
+
+        if state[self.start] == SOLVED:
+            return
+        if group_offsets[self.start] == group_offsets[self.start + 1]:
+            self._finish(self.start)
+            return
+
+        # Depth-first search that also finds strongly connected components
+        # (Tarjan). Nodes that sit on a cycle stay OPEN until the whole cycle
+        # has been explored, then _solve_component settles them together.
+        stack = [expand(self.start)]
+        while stack:
+            frame = stack[-1]
+            u, groups, position = frame[0], frame[1], frame[2]
+            if position == len(groups):
+                stack.pop()
+                if stack and low[u] < low[stack[-1][0]]:
+                    low[stack[-1][0]] = low[u]
+                if low[u] == index[u]:
+                    self._close_component(u, frame)
+                continue
+
+            group = groups[position]
+            first, last = graph.child_offsets[group], graph.child_offsets[group + 1]
+            i = first + frame[3]
+            partial = frame[4]
+            pushed = cut = False
+            while i < last:
+                child = children[i]
+                if state[child] == OPEN:
+                    # On the current cycle: its cost is not known yet, its edge is a lower bound
+                    if low[child] < low[u]:
+                        low[u] = low[child]
+                    frame[7] = True
+                    partial += edge_costs[i]
+                elif state[child] == NEW:
+                    if group_offsets[child] == group_offsets[child + 1]:
+                        self._finish(child)
+                        partial += edge_costs[i] + cost[child]
+                    elif prune and partial + edge_costs[i] >= frame[5]:
+                        cut = True
+                        break
+                    else:
+                        frame[3] = i - first
+                        frame[4] = partial
+                        stack.append(expand(child))
+                        pushed = True
+                        break
+                else:
+                    partial += edge_costs[i] + cost[child]
+                i += 1
+                if prune and partial >= frame[5] and i < last:
+                    cut = True
+                    break
+            if pushed:
+                continue
+
+            if cut:
+                self.pruned += 1
+            elif frame[7]:
+                self.cyclic[group] = 1  # settled later if u turns out to be on a longer cycle
+            else:
+                # Only groups whose children are all settled set the bar pruning compares with
+                self.group_cost[group] = partial
+                if partial < frame[5]:
+                    frame[5] = partial
+                    frame[6] = group
+            frame[2] = position + 1
+            frame[3] = 0
+            frame[4] = 0
+            frame[7] = False
+
+    def solved_nodes(self):
+        """``presolved`` tuples for every solved node, in solve order."""
+        graph, order = self.graph, self.order
+        nodes = sorted((u for u in range(graph.num_nodes) if self.state[u] == SOLVED),
+                       key=order.__getitem__)
+        return [(u, self.cost[u], self.best_group[u],
+                 tuple(None if self.cyclic[j] else self.group_cost[j] for j in graph.groups(u)),
+                 self.component[u])
+                for u in nodes]
+
+    def _build_parents(self):
+        """Owner of every group, and the groups each node appears in (CSR)."""
+        graph = self.graph
+        n = graph.num_nodes
+        owner = array('i', [0]) * (len(graph.child_offsets) - 1)
+        for u in range(n):
+            for group in graph.groups(u):
+                owner[group] = u
+        counts = array('q', [0]) * (n + 1)
+        for child in graph.children:
+            counts[child + 1] += 1
+        for u in range(n):
+            counts[u + 1] += counts[u]
+        fill = array('q', counts)
+        parent_groups = array('q', [0]) * len(graph.children)
+        for group in range(len(owner)):
+            for i in range(graph.child_offsets[group], graph.child_offsets[group + 1]):
+                child = graph.children[i]
+                parent_groups[fill[child]] = group
+                fill[child] += 1
+        self._group_owner = owner
+        self._parent_offsets = counts
+        self._parent_groups = parent_groups
+
+    def set_edge_cost(self, u, k, child, edge_cost):
+        """Change the cost of the edge to ``child`` in the ``k``-th group of ``u``."""
+        graph = self.graph
+        group = graph.group_offsets[u] + k
+        if group >= graph.group_offsets[u + 1]:
+            raise IndexError(f"node {u} has no group {k}")
+        for i in range(graph.child_offsets[group], graph.child_offsets[group + 1]):
+            if graph.children[i] == child:
+                graph.edge_costs[i] = edge_cost
+                break
+        else:
+            raise KeyError(f"group {k} of node {u} has no child {child}")
+        if self.state[u] == SOLVED or self.prune:
+            self._dirty_groups.add(group)
+
+    def set_heuristic(self, u, value):
+        """Change a node's heuristic; only a solved leaf's cost depends on it."""
+        self.graph.heuristics[u] = value
+        graph = self.graph
+        if (self.state[u] == SOLVED or self.prune) and graph.group_offsets[u] == graph.group_offsets[u + 1]:
+            self.cost[u] = value
+            self._dirty_nodes.add(u)
+
+    def resolve(self):
+        """Bring the solution up to date after updates; returns the start node's cost.
+
+        ``set_edge_cost`` and ``set_heuristic`` only mark what they touch
+        dirty. The dirty groups are recomputed from their cached neighbours'
+        costs, then every group containing a changed node, in solve order,
+        so each affected node is recomputed once; a component of several
+        nodes is re-settled as a whole.
+        """
+        if not self._dirty_groups and not self._dirty_nodes:
+            return self.cost[self.start]
+        if self.prune:
+            # Pruned groups were never fully costed, so start over
+            self._dirty_groups.clear()
+            self._dirty_nodes.clear()
+            self._reset()
+            self._solve()
+            return self.cost[self.start]
+        if self._group_owner is None:
+            self._build_parents()
+        graph, cost, order = self.graph, self.cost, self.order
+        owner, group_cost, cyclic = self._group_owner, self.group_cost, self.cyclic
+        component, components = self.component, self.components
+
+        # Children are always solved before the nodes that use them, so
+        # popping by solve order settles each node after all of its inputs.
+        # A component of several nodes is queued as a whole under its root.
+        queue = []
+        queued = set()
+
+        def touch(group):
+            u = component[owner[group]]
+            if u not in components:
+                if cyclic[group]:
+                    return
+                group_cost[group] = graph.group_cost(group, cost)
+            if u not in queued:
+                queued.add(u)
+                heapq.heappush(queue, (order[u], u))
+
+        for group in self._dirty_groups:
+            if self.state[owner[group]] == SOLVED:
+                touch(group)
+        changed = list(self._dirty_nodes)
+        self._dirty_groups.clear()
+        self._dirty_nodes.clear()
+
+        while changed or queue:
+            for v in changed:
+                for i in range(self._parent_offsets[v], self._parent_offsets[v + 1]):
+                    group = self._parent_groups[i]
+                    u = owner[group]
+                    if self.state[u] == SOLVED and component[u] != component[v]:
+                        touch(group)
+            changed = []
+            if not queue:
+                break
+            _, u = heapq.heappop(queue)
+            queued.discard(u)
+
+            if u in components:
+                members = components[u]
+                before = [cost[v] for v in members]
+                self._solve_component(members)
+                changed = [v for v, old in zip(members, before) if cost[v] != old]
+                continue
+
+            best = self.best_group[u]
+            best_cost = group_cost[best] if best >= 0 else INF
+            for group in graph.groups(u):
+                if group_cost[group] < best_cost:
+                    best, best_cost = group, group_cost[group]
+            self.best_group[u] = best
+            if best_cost != cost[u]:
+                cost[u] = best_cost
+                changed.append(u)
+
+        return cost[self.start]
+
+    def path(self):
+        return solution_path(self.graph, self.best_group, self.start)
+
+def solve(graph, start):
+    """Iterative AO* over an AndOrGraph, safe for graphs of any depth.
+
+    Returns ``(cost, best_group)``: the solved cost of every node that was
+    reached, and the chosen group of each internal node or -1. See
+    AOStarSolver for keeping the solution up to date as costs change.
+    """
+    solver = AOStarSolver(graph, start)
+    return solver.cost, solver.best_group
+
+def _frontier(graph, start, width):
+    """First breadth-first level below ``start`` with at least ``width`` internal nodes.
+
+    Their subtrees are the independent AND-children handed to workers.
+    Returns a shorter level if the graph runs out first.
+    """
+    level = [start]
+    seen = {start}
+    while True:
+        frontier = []
+        for u in level:
+            for group in graph.groups(u):
+                for child, _ in graph.group_children(group):
+                    if child not in seen and graph.group_offsets[child] != graph.group_offsets[child + 1]:
+                        seen.add(child)
+                        frontier.append(child)
+        if not frontier or len(frontier) >= width:
+            return frontier
+        level = frontier
+
+# The graph each pool worker solves subtrees of; only the subtree roots travel with tasks
+_graph = None
+_prune = False
+
+def _init_worker(graph, prune):
+    global _graph, _prune
+    _graph, _prune = graph, prune
+
+def _solve_subtree(root):
+    return AOStarSolver(_graph, root, _prune).solved_nodes()
+
+def solve_parallel(graph, start, processes=None, prune=False, width=None):
+    """AOStarSolver whose AND-children subtrees are solved on a process pool.
+
+    The graph is expanded breadth-first from ``start`` until a level has
+    ``width`` internal nodes (default: four per process). Each of their
+    subtrees is solved by a worker, and the results are merged into one
+    solver that then finishes the top of the graph in-process.
+
+    Nodes shared between subtrees are solved by every worker that reaches
+    them and the first result is kept, so this pays off when the subtrees
+    are mostly disjoint. A worker that reaches one node of a cycle solves
+    the whole component, so the costs are those of a sequential solve.
+    """
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    frontier = _frontier(graph, start, width or 4 * processes)
+    if len(frontier) < 2 or processes < 2:
+        return AOStarSolver(graph, start, prune)
+
+    # Forked workers share the graph's arrays with the parent instead of unpickling a copy
+    fork = "fork" in multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if fork else None)
+    with context.Pool(processes, _init_worker, (graph, prune)) as pool:
+        results = pool.map(_solve_subtree, frontier, chunksize=1)
+    presolved = [entry for result in results for entry in result]
+    return AOStarSolver(graph, start, prune, presolved)
+
+def solution_path(graph, best_group, start):
+    """Nodes of the solution graph below ``start`` in depth-first order, each once."""
+    path = []
+    seen = set()
+    stack = [start]
+    while stack:
+        u = stack.pop()
+        if u in seen:
+            continue
+        seen.add(u)
+        path.append(u)
+        group = best_group[u]
+        if group >= 0:
+            first, last = graph.child_offsets[group], graph.child_offsets[group + 1]
+            for i in range(last - 1, first - 1, -1):
+                if graph.children[i] not in seen:
+                    stack.append(graph.children[i])
+    return path
+
+def aostar_iterative(graph, heuristic, start="S"):
+    """Drop-in replacement for ``aostar`` built on AndOrGraph and ``solve``."""
+    and_or = AndOrGraph.from_dict(graph, heuristic)
+    root = and_or.index[start]
+    cost, best_group = solve(and_or, root)
+    return cost[root], [and_or.names[u] for u in solution_path(and_or, best_group, root)]
+
 # Updated graph structure with proper (child, edge_cost) pairs
 graph = {
     'S': [[('B', 1), ('C', 1)]],
@@ -102,7 +646,8 @@ heuristic = {
     'M': 0
 }
 
-# Run A* search
-result, path = aostar(graph, heuristic, "S")
-print("Minimum cost from S:", result)
-print("Path:", path)
+if __name__ == "__main__":
+    # Run A* search
+    result, path = aostar(graph, heuristic, "S")
+    print("Minimum cost from S:", result)
+    print("Path:", path)
@@ -1,4 +1,9 @@
 import heapq
+import sys
+from array import array
+
+INF = float("inf")
+
 
 class Node:
     def __init__(self, value, heuristic):
@@ -65,6 +70,284 @@ def a_star_search(source, goal):
     print("No path found!")
 
 
+def typecode(values):
+    """Element type of an ``array`` or of a memoryview over a graph file."""
+    return getattr(values, "typecode", None) or values.format
+
+
+class CSRGraph:
+    """Read-only graph stored as compressed sparse row arrays.
+
+    Nodes are integer ids ``0..n-1``. The outgoing edges of ``u`` are
+    ``targets[offsets[u]:offsets[u + 1]]`` with the matching ``weights``,
+    and ``heuristics[u]`` is the estimate from ``u`` to the goal. Searches
+    never write to the graph, so one instance can be shared by any number
+    of concurrent queries.
+    """
+
+    def __init__(self, names, offsets, targets, weights, heuristics, coords=None):
+        self.names = names
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.heuristics = heuristics
+        self.coords = coords  # optional (xs, ys) arrays
+        self._index = None
+        self._reverse = None
+
+    @property
+    def index(self):
+        # Built on first use so that opening a large graph stays cheap.
+        if self._index is None:
+            self._index = {name: i for i, name in enumerate(self.names)}
+        return self._index
+
+    @property
+    def num_nodes(self):
+        return len(self.offsets) - 1
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    def neighbors(self, u):
+        for e in range(self.offsets[u], self.offsets[u + 1]):
+            yield self.targets[e], self.weights[e]
+
+    def edge_weight(self, u, v):
+        best = None
+        for target, w in self.neighbors(u):
+            if target == v and (best is None or w < best):
+                best = w
+        return best
+
+    def reversed(self):
+        """The graph with every edge flipped, built on first use."""
+        if self._reverse is None:
+            sources = array("i", [0]) * self.num_edges
+            for u in range(self.num_nodes):
+                for e in range(self.offsets[u], self.offsets[u + 1]):
+                    sources[e] = u
+            self._reverse = CSRGraph.from_arrays(self.names, self.targets, sources,
+                                                 self.weights, coords=self.coords)
+        return self._reverse
+
+    @classmethod
+    def from_arrays(cls, names, sources, targets, weights, heuristics=None, coords=None):
+        """Build a graph from parallel edge arrays over integer ids.
+
+        Edges are bucketed by source with a counting sort, so the input
+        may be in any order.
+        """
+        n = len(names)
+        m = len(sources)
+        offsets = array("q", [0]) * (n + 1)
+        for u in sources:
+            offsets[u + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+
+        csr_targets = array("i", [0]) * m
+        csr_weights = array(typecode(weights), [0]) * m
+        fill = array("q", offsets[:n])
+        for u, v, w in zip(sources, targets, weights):
+            e = fill[u]
+            csr_targets[e] = v
+            csr_weights[e] = w
+            fill[u] = e + 1
+
+        if heuristics is None:
+            heuristics = array("q", [0]) * n
+        return cls(names, offsets, csr_targets, csr_weights, heuristics, coords)
+
+    @classmethod
+    def from_edges(cls, names, edges, heuristics=None):
+        """Build a graph from ``(u, v, weight)`` triples over integer ids."""
+        integral = all(isinstance(w, int) for _, _, w in edges)
+        sources = array("i", (u for u, _, _ in edges))
+        targets = array("i", (v for _, v, _ in edges))
+        weights = array("q" if integral else "d", (w for _, _, w in edges))
+        if heuristics is not None:
+            integral = all(isinstance(h, int) for h in heuristics)
+            heuristics = array("q" if integral else "d", heuristics)
+        return cls.from_arrays(list(names), sources, targets, weights, heuristics)
+
+    @classmethod
+    def from_node_map(cls, city_map):
+        """Convert a ``{name: Node}`` map such as ``build_romania_map()``."""
+        names = list(city_map)
+        index = {name: i for i, name in enumerate(names)}
+        edges = [(index[name], index[neighbor.value], distance)
+                 for name, node in city_map.items()
+                 for neighbor, distance in node.neighbors]
+        heuristics = [city_map[name].heuristic for name in names]
+        return cls.from_edges(names, edges, heuristics)
+
+
+def walk_parents(parent, source, goal):
+    path = [goal]
+    while path[-1] != source:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return path
+
+
+def csr_a_star(graph, source, goal, heuristic=None):
+    """A* over a CSRGraph between integer node ids.
+
+    All per-query state lives in arrays owned by this call. Returns
+    ``(path, distance, expanded)``; ``path`` is ``None`` if the goal is
+    unreachable.
+    """
+    n = graph.num_nodes
+    h = graph.heuristics if heuristic is None else heuristic
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+
+    g = array("d", [INF]) * n
+    parent = array("i", [-1]) * n
+    g[source] = 0
+    open_list = [(h[source], 0, source)]
+    expanded = 0
+
+    while open_list:
+        _, g_u, u = heapq.heappop(open_list)
+        if g_u > g[u]:
+            continue  # stale entry, a cheaper one was already pushed
+        expanded += 1
+
+        if u == goal:
+            return walk_parents(parent, source, goal), g_u, expanded
+
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            new_cost = g_u + weights[e]
+            if new_cost < g[v]:
+                g[v] = new_cost
+                parent[v] = u
+                heapq.heappush(open_list, (new_cost + h[v], new_cost, v))
+
+    return None, INF, expanded
+
+
+def shortest_path_tree(graph, source):
+    """Dijkstra from ``source`` to every node.
+
+    Returns ``(distances, parents)`` arrays; unreachable nodes keep an
+    infinite distance and a parent of -1. Run it on ``graph.reversed()``
+    to get distances *to* ``source`` instead.
+    """
+    n = graph.num_nodes
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    g = array("d", [INF]) * n
+    parent = array("i", [-1]) * n
+    g[source] = 0
+    open_list = [(0, source)]
+
+    while open_list:
+        g_u, u = heapq.heappop(open_list)
+        if g_u > g[u]:
+            continue
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            new_cost = g_u + weights[e]
+            if new_cost < g[v]:
+                g[v] = new_cost
+                parent[v] = u
+                heapq.heappush(open_list, (new_cost, v))
+
+    return g, parent
+
+
+def bidirectional_a_star(graph, source, goal, heuristic=None, source_heuristic=None):
+    """Bidirectional A* over a CSRGraph.
+
+    ``heuristic`` estimates the distance to ``goal`` and ``source_heuristic``
+    the distance from ``source`` (zero if not given). Both searches use the
+    average potential ``(h_goal - h_source) / 2``, which stays consistent
+    when the inputs are, so the search can stop as soon as the two frontier
+    minimums sum to at least the best meeting distance found. Returns the
+    same ``(path, distance, expanded)`` triple as ``csr_a_star``.
+    """
+    n = graph.num_nodes
+    h_goal = graph.heuristics if heuristic is None else heuristic
+    h_source = source_heuristic
+
+    def potential(v):
+        if h_source is None:
+            return h_goal[v] / 2
+        return (h_goal[v] - h_source[v]) / 2
+
+    if source == goal:
+        return [source], 0, 1
+
+    sides = []
+    for graph_side, start, sign in ((graph, source, 1), (graph.reversed(), goal, -1)):
+        g = array("d", [INF]) * n
+        parent = array("i", [-1]) * n
+        g[start] = 0
+        sides.append((graph_side, g, parent, [(sign * potential(start), 0, start)], sign))
+
+    best = INF
+    meeting = -1
+    expanded = 0
+    while sides[0][3] and sides[1][3]:
+        if sides[0][3][0][0] + sides[1][3][0][0] >= best:
+            break
+
+        # Grow the smaller frontier
+        side = 0 if len(sides[0][3]) <= len(sides[1][3]) else 1
+        graph_side, g, parent, open_list, sign = sides[side]
+        other_g = sides[1 - side][1]
+
+        _, g_u, u = heapq.heappop(open_list)
+        if g_u > g[u]:
+            continue
+        expanded += 1
+
+        offsets, targets, weights = graph_side.offsets, graph_side.targets, graph_side.weights
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            new_cost = g_u + weights[e]
+            if new_cost < g[v]:
+                g[v] = new_cost
+                parent[v] = u
+                heapq.heappush(open_list, (new_cost + sign * potential(v), new_cost, v))
+                if new_cost + other_g[v] < best:
+                    best = new_cost + other_g[v]
+                    meeting = v
+
+    if meeting < 0:
+        return None, INF, expanded
+
+    path = walk_parents(sides[0][2], source, meeting)
+    node = meeting
+    while node != goal:
+        node = sides[1][2][node]
+        path.append(node)
+    return path, best, expanded
+
+
+SEARCH_MODES = {
+    "a_star": csr_a_star,
+    "bidirectional": bidirectional_a_star,
+}
+
+
+def print_route(graph, path):
+    """Print a node-id path in the same format as ``print_path``."""
+    if path is None:
+        print("No path found!")
+        return
+
+    print("Optimal Path:", " -> ".join(graph.names[u] for u in path))
+
+    total_distance = 0
+    for i in range(1, len(path)):
+        total_distance += graph.edge_weight(path[i - 1], path[i])
+
+    print("Total Distance:", total_distance, "km")
+
+
 def build_romania_map():
     city_map = {
         "Arad": Node("Arad", 366),
@@ -101,14 +384,34 @@ def build_romania_map():
     return city_map
 
 
+def build_romania_graph():
+    return CSRGraph.from_node_map(build_romania_map())
+
+
 if __name__ == "__main__":
-    city_map = build_romania_map()
+    if len(sys.argv) > 1:
+        from graph_loader import open_graph
+        graph = open_graph(sys.argv[1])
+    else:
+        graph = build_romania_graph()
 
     start_city = input("Enter starting city: ").strip()
     goal_city = input("Enter goal city: ").strip()
 
-    if start_city not in city_map or goal_city not in city_map:
+    if start_city not in graph.index or goal_city not in graph.index:
         print("Invalid city names! Please enter valid cities from the map.")
     else:
+        mode = input(f"Search mode ({'/'.join(SEARCH_MODES)}/alt/ch) [a_star]: ").strip() or "a_star"
+        search = SEARCH_MODES.get(mode, csr_a_star)
+        if mode == "alt":
+            from landmarks import alt_a_star, load_or_build_landmarks
+            landmarks = load_or_build_landmarks(graph, sys.argv[1] if len(sys.argv) > 1 else None)
+            search = lambda graph, source, goal: alt_a_star(graph, source, goal, landmarks)
+        elif mode == "ch":
+            from contraction_hierarchy import build_contraction_hierarchy, ch_query
+            hierarchy = build_contraction_hierarchy(graph)
+            search = lambda graph, source, goal: ch_query(hierarchy, source, goal)
         print(f"\nSearching for shortest path from {start_city} to {goal_city} using A*...\n")
-        a_star_search(city_map[start_city], city_map[goal_city])
+        path, _, expanded = search(graph, graph.index[start_city], graph.index[goal_city])
+        print_route(graph, path)
+        print("Nodes expanded:", expanded)
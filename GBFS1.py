@@ -1,51 +1,174 @@
 import heapq
+import itertools
+import sys
+import time
 
 class Node:
     def __init__(self, value, heuristic):
         self.value = value
         self.heuristic = heuristic
-        self.parent = None
         self.neighbors = []
-        self.distance_from_start = 0
 
     def __lt__(self, other):
-        return self.heuristic < other.heuristic
+        # Break heuristic ties by name so heap order never depends on insertion luck
+        return (self.heuristic, self.value) < (other.heuristic, other.value)
 
-def greedy_best_first_search(source, goal):
+class SearchResult:
+    """Outcome of one search: the route, its length and how much work it took."""
+
+    def __init__(self, path, distance, expanded, generated):
+        self.path = path  # city names from start to goal, empty if unreachable
+        self.distance = distance
+        self.expanded = expanded
+        self.generated = generated
+
+    @property
+    def found(self):
+        return bool(self.path)
+
+def greedy_best_first_search(source, goal, trace=None):
+    """Greedy best-first search between two linked Nodes.
+
+    Returns a SearchResult. ``trace``, if given, is called with every node
+    as it is expanded. Parents and distances are kept per call, so the
+    shared Nodes are never modified.
+    """
     explored = set()
     queue = []
     queue_contents = set()
+    parent = {source: None}
+    distance_from_start = {source: 0}
+    tie = itertools.count()  # FIFO among equal heuristics
 
-    source.distance_from_start = 0
-    heapq.heappush(queue, source)
+    heapq.heappush(queue, (source.heuristic, next(tie), source))
     queue_contents.add(source)
+    generated = 1
 
     while queue:
-        current = heapq.heappop(queue)
+        _, _, current = heapq.heappop(queue)
         queue_contents.remove(current)
-        print(f" -> {current.value}", end='')
+        if trace is not None:
+            trace(current)
         explored.add(current)
 
         if current.value == goal.value:
-            print(f"\nPath found to: {current.value}")
-            path = []
-            total_distance = current.distance_from_start
-            while current:
-                path.append(current)
-                current = current.parent
-            path.reverse()
-            print("Shortest Path:", ' -> '.join([node.value for node in path]))
-            print("Total Distance:", total_distance, "km")
-            return
+            return SearchResult(_walk_path(parent, current), distance_from_start[current],
+                                len(explored), generated)
 
         for neighbor, distance in current.neighbors:
             if neighbor not in explored and neighbor not in queue_contents:
-                neighbor.parent = current
-                neighbor.distance_from_start = current.distance_from_start + distance
-                heapq.heappush(queue, neighbor)
+                parent[neighbor] = current
+                distance_from_start[neighbor] = distance_from_start[current] + distance
+                heapq.heappush(queue, (neighbor.heuristic, next(tie), neighbor))
                 queue_contents.add(neighbor)
+                generated += 1
+
+    return SearchResult([], float('inf'), len(explored), generated)
+
+def print_result(result):
+    if not result.found:
+        print("\nGoal not reachable.")
+        return
+    print(f"\nPath found to: {result.path[-1]}")
+    print("Shortest Path:", ' -> '.join(result.path))
+    print("Total Distance:", result.distance, "km")
+
+def _walk_path(parent, node):
+    path = []
+    while node:
+        path.append(node.value)
+        node = parent[node]
+    path.reverse()
+    return path
+
+def anytime_search(source, goal, epsilon=3.0, step=0.5, deadline=None, cancelled=None):
+    """Anytime Repairing A* (ARA*) between two linked Nodes.
 
-    print("\nGoal not reachable.")
+    Yields ``(path, distance, bound)`` each time the route or its bound improves,
+    starting with a weighted-A* search at ``epsilon`` and lowering the
+    weight by ``step`` until it reaches 1 or the route is proven optimal
+    (bound 1). ``bound`` guarantees ``distance <= bound * optimal``. Search
+    state carries over between weights, so each pass only repairs what the
+    previous one left inconsistent. Stops early once ``time.monotonic()``
+    passes ``deadline`` or ``cancelled()`` returns true.
+    """
+    g = {source: 0}
+    parent = {source: None}
+    tie = itertools.count()
+    open_keys = {source: epsilon * source.heuristic}
+    open_list = [(open_keys[source], next(tie), source)]
+    closed = set()
+    incons = set()
+
+    def stopped():
+        return ((deadline is not None and time.monotonic() >= deadline)
+                or (cancelled is not None and cancelled()))
+
+    def push(node):
+        key = g[node] + epsilon * node.heuristic
+        open_keys[node] = key
+        heapq.heappush(open_list, (key, next(tie), node))
+
+    def improve_path():
+        while open_list:
+            key, _, current = open_list[0]
+            if open_keys.get(current) != key:
+                heapq.heappop(open_list)  # superseded entry
+                continue
+            if g.get(goal, float('inf')) <= key:
+                return True
+            if stopped():
+                return False
+            heapq.heappop(open_list)
+            del open_keys[current]
+            closed.add(current)
+            for neighbor, distance in current.neighbors:
+                new_cost = g[current] + distance
+                if new_cost < g.get(neighbor, float('inf')):
+                    g[neighbor] = new_cost
+                    parent[neighbor] = current
+                    if neighbor in closed:
+                        incons.add(neighbor)
+                    else:
+                        push(neighbor)
+        return True
+
+    best = float('inf')
+    best_bound = float('inf')
+    while True:
+        finished = improve_path()
+        if goal in g:
+            lower = min((g[n] + n.heuristic for n in itertools.chain(open_keys, incons)),
+                        default=float('inf'))
+            if g[goal] <= lower:
+                bound = 1.0  # nothing left open can lead to a shorter route
+            elif lower > 0:
+                bound = g[goal] / lower
+            else:
+                bound = float('inf')
+            if finished:
+                bound = min(bound, epsilon)  # only a completed pass is within epsilon
+            else:
+                bound = min(bound, best_bound)  # the route is no longer than the last one reported
+            if g[goal] < best or bound < best_bound:
+                best, best_bound = g[goal], bound
+                yield _walk_path(parent, goal), best, bound
+        if not finished or epsilon <= 1 or best_bound <= 1 or stopped():
+            return
+
+        epsilon = max(1.0, epsilon - step)
+        open_list.clear()
+        for node in list(open_keys) + list(incons):
+            push(node)
+        incons.clear()
+        closed.clear()
+
+def build_city_map(graph):
+    """Create linked Nodes from a CSRGraph, e.g. one opened with graph_loader."""
+    nodes = [Node(graph.names[u], graph.heuristics[u]) for u in range(graph.num_nodes)]
+    for u, node in enumerate(nodes):
+        node.neighbors = [(nodes[v], distance) for v, distance in graph.neighbors(u)]
+    return {node.value: node for node in nodes}
 
 # Create city nodes with heuristics
 city_map = {
@@ -82,11 +205,24 @@ city_map["Bucharest"].neighbors = [(city_map["Pitesti"], 101), (city_map["Giurgi
 city_map["Giurgiu"].neighbors = [(city_map["Bucharest"], 90)]
 
 # Input and execution
-start_city = input("Enter Start City: ")
-goal_city = input("Enter Destination City: ")
-
-if start_city not in city_map or goal_city not in city_map:
-    print("Invalid city name. Please try again.")
-else:
-    print(f"Finding path from {start_city} to {goal_city}...")
-    greedy_best_first_search(city_map[start_city], city_map[goal_city])
+if __name__ == "__main__":
+    # A binary graph file written by graph_loader replaces the map above
+    if len(sys.argv) > 1:
+        from graph_loader import open_graph
+        city_map = build_city_map(open_graph(sys.argv[1]))
+
+    start_city = input("Enter Start City: ")
+    goal_city = input("Enter Destination City: ")
+
+    if start_city not in city_map or goal_city not in city_map:
+        print("Invalid city name. Please try again.")
+    elif input("Search mode (greedy/anytime) [greedy]: ").strip() == "anytime":
+        print(f"Finding path from {start_city} to {goal_city}...")
+        for path, distance, bound in anytime_search(city_map[start_city], city_map[goal_city],
+                                                    deadline=time.monotonic() + 1.0):
+            print(' -> '.join(path), f"({distance} km, within {bound:.2f}x of optimal)")
+    else:
+        print(f"Finding path from {start_city} to {goal_city}...")
+        result = greedy_best_first_search(city_map[start_city], city_map[goal_city],
+                                          trace=lambda node: print(f" -> {node.value}", end=''))
+        print_result(result)
@@ -1,7 +1,10 @@
 import random
 import math
-import matplotlib.pyplot as plt
-import seaborn as sns
+import multiprocessing
+import time
+from array import array
+from collections import deque
+from functools import lru_cache
 
 # Define 5 cities with (x, y) coordinates
 cities = [(1, 1), (3, 5), (5, 8), (7, 6), (9, 3)]
@@ -10,12 +13,129 @@ cities = [(1, 1), (3, 5), (5, 8), (7, 6), (9, 3)]
 def distance(city1, city2):
     return math.sqrt((city1[0] - city2[0])**2 + (city1[1] - city2[1])**2)
 
+def _nint(x):
+    return int(x + 0.5)
+
+_TSPLIB_PI = 3.141592  # the value the TSPLIB GEO distance is defined with, not math.pi
+
+def _geo_radians(x):
+    degrees = int(x)  # truncates toward zero, like the C cast in TSPLIB
+    return _TSPLIB_PI * (degrees + 5.0 * (x - degrees) / 3.0) / 180.0
+
+def _geo_distance(city1, city2):
+    lat1, lon1 = _geo_radians(city1[0]), _geo_radians(city1[1])
+    lat2, lon2 = _geo_radians(city2[0]), _geo_radians(city2[1])
+    q1 = math.cos(lon1 - lon2)
+    q2 = math.cos(lat1 - lat2)
+    q3 = math.cos(lat1 + lat2)
+    return int(6378.388 * math.acos(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)) + 1.0)
+
+def _att_distance(city1, city2):
+    r = math.sqrt(((city1[0] - city2[0])**2 + (city1[1] - city2[1])**2) / 10.0)
+    t = _nint(r)
+    return t + 1 if t < r else t
+
+# TSPLIB EDGE_WEIGHT_TYPE -> distance function; EXACT is plain Euclidean
+DISTANCE_FUNCTIONS = {
+    "EXACT": distance,
+    "EUC_2D": lambda a, b: _nint(distance(a, b)),
+    "CEIL_2D": lambda a, b: math.ceil(distance(a, b)),
+    "ATT": _att_distance,
+    "GEO": _geo_distance,
+}
+
+class TSPProblem:
+    """A TSP instance: city coordinates and a precomputed distance lookup.
+
+    Up to ``matrix_limit`` cities, every distance is computed once into a
+    flat n*n array of floats. Larger instances compute distances on demand
+    and keep the most recent ``cache_size`` of them.
+    """
+
+    def __init__(self, coords, weight_type="EXACT", matrix_limit=4000, cache_size=1 << 20, name=None):
+        self.coords = [tuple(c) for c in coords]
+        self.n = len(self.coords)
+        self.weight_type = weight_type
+        self.name = name
+        self._candidates = {}
+        self.cache_size = cache_size
+        if self.n <= matrix_limit:
+            measure = DISTANCE_FUNCTIONS[weight_type]
+            n, pts = self.n, self.coords
+            self.matrix = array("d", (measure(pts[i], pts[j]) for i in range(n) for j in range(n)))
+        else:
+            self.matrix = None
+        self._bind_dist()
+
+    def _bind_dist(self):
+        if self.matrix is not None:
+            n, matrix = self.n, self.matrix
+            self.dist = lambda i, j: matrix[i * n + j]
+        else:
+            measure = DISTANCE_FUNCTIONS[self.weight_type]
+            pts = self.coords
+
+            @lru_cache(maxsize=self.cache_size)
+            def pair_distance(i, j):
+                return measure(pts[i], pts[j])
+
+            self.dist = lambda i, j: pair_distance(i, j) if i < j else pair_distance(j, i)
+
+    # Pickled without the dist closure so problems can be sent to worker processes
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["dist"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._bind_dist()
+
+    @classmethod
+    def from_tsplib(cls, path, **kwargs):
+        """Load a TSPLIB ``.tsp`` file with a NODE_COORD_SECTION."""
+        header = {}
+        coords = []
+        with open(path) as f:
+            lines = iter(f)
+            for line in lines:
+                line = line.strip()
+                if line.startswith("NODE_COORD_SECTION"):
+                    break
+                if ":" in line:
+                    key, value = line.split(":", 1)
+                    header[key.strip().upper()] = value.strip()
+            for line in lines:
+                parts = line.split()
+                if not parts or parts[0] == "EOF":
+                    break
+                coords.append((float(parts[1]), float(parts[2])))
+
+        weight_type = header.get("EDGE_WEIGHT_TYPE", "EUC_2D")
+        if weight_type not in DISTANCE_FUNCTIONS:
+            raise ValueError(f"unsupported EDGE_WEIGHT_TYPE {weight_type!r} in {path}")
+        if "DIMENSION" in header and int(header["DIMENSION"]) != len(coords):
+            raise ValueError(f"{path} declares {header['DIMENSION']} cities but lists {len(coords)}")
+        return cls(coords, weight_type, name=header.get("NAME"), **kwargs)
+
+    def candidates(self, k):
+        """The k nearest neighbours of every city, computed once per k."""
+        if k not in self._candidates:
+            self._candidates[k] = nearest_neighbors(self.coords, k)
+        return self._candidates[k]
+
+    def tour_length(self, tour):
+        dist = self.dist
+        total = dist(tour[-1], tour[0])
+        for i in range(len(tour) - 1):
+            total += dist(tour[i], tour[i + 1])
+        return total
+
+default_problem = TSPProblem(cities)
+
 # Compute total tour distance
-def tour_length(tour):
-    total = 0
-    for i in range(len(tour)):
-        total += distance(cities[tour[i]], cities[tour[(i + 1) % len(tour)]])
-    return total
+def tour_length(tour, problem=None):
+    return (problem or default_problem).tour_length(tour)
 
 # Generate a neighbor by swapping two cities
 def get_neighbor(tour):
@@ -24,16 +144,238 @@ def get_neighbor(tour):
     new_tour[i], new_tour[j] = new_tour[j], new_tour[i]
     return new_tour
 
+# k nearest cities of every city, found through a uniform grid over the coordinates
+def nearest_neighbors(coords, k):
+    n = len(coords)
+    k = min(k, n - 1)
+    if k <= 0:
+        return [[] for _ in range(n)]
+    xs = [c[0] for c in coords]
+    ys = [c[1] for c in coords]
+    min_x, min_y = min(xs), min(ys)
+    span = max(max(xs) - min_x, max(ys) - min_y) or 1.0
+    side = max(1, int(math.sqrt(n / 2)))  # about two cities per cell
+    cell = span / side
+
+    grid = {}
+    for i, (x, y) in enumerate(coords):
+        grid.setdefault((int((x - min_x) / cell), int((y - min_y) / cell)), []).append(i)
+
+    neighbors = []
+    for i, (x, y) in enumerate(coords):
+        cx, cy = int((x - min_x) / cell), int((y - min_y) / cell)
+        found = []
+        ring = 0
+        while True:
+            for gx in range(cx - ring, cx + ring + 1):
+                for gy in range(cy - ring, cy + ring + 1):
+                    if max(abs(gx - cx), abs(gy - cy)) != ring:
+                        continue
+                    for j in grid.get((gx, gy), ()):
+                        if j != i:
+                            found.append(((xs[j] - x)**2 + (ys[j] - y)**2, j))
+            # Cities outside the rings searched so far are at least ring * cell away
+            if len(found) >= k:
+                found.sort()
+                if found[k - 1][0] <= (ring * cell)**2 or ring > side:
+                    break
+            elif ring > side:
+                break
+            ring += 1
+        neighbors.append([j for _, j in found[:k]])
+    return neighbors
+
+class TourState:
+    """A tour as a city array plus each city's position, for O(1) succ/pred."""
+
+    def __init__(self, tour, problem):
+        self.tour = list(tour)
+        self.n = len(self.tour)
+        self.pos = [0] * self.n
+        for i, city in enumerate(self.tour):
+            self.pos[city] = i
+        self.dist = problem.dist
+
+    def succ(self, city):
+        return self.tour[(self.pos[city] + 1) % self.n]
+
+    def pred(self, city):
+        return self.tour[self.pos[city] - 1]
+
+    def _reverse(self, i, j):
+        """Reverse tour positions i..j, walking forward (and wrapping) from i."""
+        tour, pos, n = self.tour, self.pos, self.n
+        for _ in range(((j - i) % n + 1) // 2):
+            a, b = tour[i], tour[j]
+            tour[i], tour[j] = b, a
+            pos[b], pos[a] = i, j
+            i = (i + 1) % n
+            j = (j - 1) % n
+
+    def reverse_path(self, first, last):
+        """Reverse the path first..last; the shorter side of the cycle is flipped."""
+        i, j = self.pos[first], self.pos[last]
+        if (j - i) % self.n * 2 > self.n:
+            i, j = (j + 1) % self.n, (i - 1) % self.n
+        self._reverse(i, j)
+
+    # 2-opt: remove (a, succ a) and (c, succ c), add (a, c) and (succ a, succ c)
+    def two_opt_delta(self, a, c):
+        sa, sc = self.succ(a), self.succ(c)
+        if c == a or c == sa or sc == a:
+            return 0
+        d = self.dist
+        return d(a, c) + d(sa, sc) - d(a, sa) - d(c, sc)
+
+    def apply_two_opt(self, a, c):
+        self.reverse_path(self.succ(a), c)
+
+    # Or-opt: move the segment of `length` cities starting at s between c and succ c
+    def _segment_end(self, s, length):
+        return self.tour[(self.pos[s] + length - 1) % self.n]
+
+    def or_opt_valid(self, s, length, c):
+        if length >= self.n - 1:
+            return False
+        offset = (self.pos[c] - self.pos[s]) % self.n
+        return offset >= length and c != self.pred(s)
+
+    def or_opt_delta(self, s, length, c, reverse):
+        d = self.dist
+        e = self._segment_end(s, length)
+        p, nx, cn = self.pred(s), self.succ(e), self.succ(c)
+        removed = d(p, s) + d(e, nx) + d(c, cn)
+        added = d(p, nx) + (d(c, e) + d(s, cn) if reverse else d(c, s) + d(e, cn))
+        return added - removed
+
+    def apply_or_opt(self, s, length, c, reverse):
+        n = self.n
+        i = self.pos[s]
+        j = (i + length - 1) % n
+        after = (self.pos[c] - j) % n             # cities from succ(e) to c
+        before = (i - self.pos[c] - 1) % n        # cities from succ(c) to pred(s)
+        if after <= before:
+            # ... S Y ... -> ... Y S ...
+            k = self.pos[c]
+            self._reverse(i, k)
+            self._reverse(i, (i + after - 1) % n)
+            if not reverse:
+                self._reverse((i + after) % n, k)
+        else:
+            # ... Y S ... -> ... S Y ...
+            k = (self.pos[c] + 1) % n
+            self._reverse(k, j)
+            if not reverse:
+                self._reverse(k, (k + length - 1) % n)
+            self._reverse((k + length) % n, j)
+
+def improve_tour(tour, problem, candidates=8, max_moves=None, or_opt=True):
+    """2-opt and Or-opt local search with candidate lists and don't-look bits.
+
+    Only moves that connect a city to one of its ``candidates`` nearest
+    neighbours are tried, every move is priced in O(1), and a city is only
+    re-examined after one of its tour edges changed. Stops at a local
+    optimum or after ``max_moves`` improving moves.
+    """
+    state = TourState(tour, problem)
+    neighbors = problem.candidates(candidates)
+    d = problem.dist
+    queue = deque(state.tour)
+    active = bytearray(b"\1") * state.n
+    moves = 0
+
+    def wake(*cities):
+        for city in cities:
+            if not active[city]:
+                active[city] = 1
+                queue.append(city)
+
+    while queue and (max_moves is None or moves < max_moves):
+        a = queue.popleft()
+        active[a] = 0
+        improved = False
+
+        for c in neighbors[a]:
+            # a -> succ(a) replaced by a -> c
+            sa = state.succ(a)
+            if d(a, c) >= d(a, sa):
+                break
+            if state.two_opt_delta(a, c) < -1e-10:
+                sc = state.succ(c)
+                state.apply_two_opt(a, c)
+                wake(a, sa, c, sc)
+                improved = True
+                break
+        if not improved:
+            for c in neighbors[a]:
+                # pred(a) -> a replaced by c -> a
+                pa = state.pred(a)
+                if d(a, c) >= d(pa, a):
+                    break
+                pc = state.pred(c)
+                if state.two_opt_delta(pc, pa) < -1e-10:
+                    state.apply_two_opt(pc, pa)
+                    wake(a, pa, c, pc)
+                    improved = True
+                    break
+        if not improved and or_opt:
+            for length in (1, 2, 3):
+                for c in neighbors[a]:
+                    for target in (c, state.pred(c)):
+                        for reverse in (False, True):
+                            if (state.or_opt_valid(a, length, target)
+                                    and state.or_opt_delta(a, length, target, reverse) < -1e-10):
+                                e = state._segment_end(a, length)
+                                touched = (state.pred(a), state.succ(e), target, state.succ(target), e)
+                                state.apply_or_opt(a, length, target, reverse)
+                                wake(a, *touched)
+                                improved = True
+                                break
+                        if improved:
+                            break
+                    if improved:
+                        break
+                if improved:
+                    break
+
+        if improved:
+            moves += 1
+            wake(a)
+
+    return state.tour, problem.tour_length(state.tour)
+
+def random_move(state, neighbors):
+    """A random candidate-list move as (delta, apply) for stochastic search."""
+    a = random.randrange(state.n)
+    if not neighbors[a]:
+        return 0, lambda: None
+    c = random.choice(neighbors[a])
+    if random.random() < 0.5:
+        if random.random() < 0.5:
+            return state.two_opt_delta(a, c), lambda: state.apply_two_opt(a, c)
+        pa, pc = state.pred(a), state.pred(c)
+        return state.two_opt_delta(pc, pa), lambda: state.apply_two_opt(pc, pa)
+    length = random.randint(1, 3)
+    reverse = random.random() < 0.5
+    if not state.or_opt_valid(a, length, c):
+        return 0, lambda: None
+    return state.or_opt_delta(a, length, c, reverse), lambda: state.apply_or_opt(a, length, c, reverse)
+
 # Standard Hill Climbing for TSP
-def hill_climbing(max_iterations):
-    tour = list(range(len(cities)))  # Initial tour: [0, 1, 2, 3, 4]
+def hill_climbing(max_iterations, problem=None, neighborhood="swap", candidates=8):
+    problem = problem or default_problem
+    tour = list(range(problem.n))  # Initial tour: [0, 1, 2, 3, 4]
     random.shuffle(tour)
+    if neighborhood == "2opt":
+        # Climb to a 2-opt/Or-opt local optimum, making at most max_iterations moves
+        return improve_tour(tour, problem, candidates, max_moves=max_iterations)
+
     best_tour = tour
-    best_distance = tour_length(tour)
+    best_distance = problem.tour_length(tour)
 
     for _ in range(max_iterations):
         neighbor = get_neighbor(best_tour)
-        neighbor_distance = tour_length(neighbor)
+        neighbor_distance = problem.tour_length(neighbor)
 
         if neighbor_distance < best_distance:
             best_tour = neighbor
@@ -44,15 +386,26 @@ def hill_climbing(max_iterations):
     return best_tour, best_distance
 
 # Stochastic Hill Climbing for TSP
-def stochastic_hill_climbing(max_iterations, T=1.0):
-    tour = list(range(len(cities)))
+def stochastic_hill_climbing(max_iterations, T=1.0, problem=None, neighborhood="swap", candidates=8):
+    problem = problem or default_problem
+    tour = list(range(problem.n))
     random.shuffle(tour)
+    if neighborhood == "2opt":
+        # Random candidate-list 2-opt/Or-opt moves, each priced in O(1)
+        state = TourState(tour, problem)
+        neighbors = problem.candidates(candidates)
+        for _ in range(max_iterations):
+            delta, apply = random_move(state, neighbors)
+            if delta < 0 or random.random() < math.exp(-delta / T):
+                apply()
+        return state.tour, problem.tour_length(state.tour)
+
     best_tour = tour
-    best_distance = tour_length(tour)
+    best_distance = problem.tour_length(tour)
 
     for _ in range(max_iterations):
         neighbor = get_neighbor(best_tour)
-        neighbor_distance = tour_length(neighbor)
+        neighbor_distance = problem.tour_length(neighbor)
         delta = neighbor_distance - best_distance  # Positive if worse
 
         if delta < 0 or random.random() < math.exp(-delta / T):
@@ -61,20 +414,239 @@ def stochastic_hill_climbing(max_iterations, T=1.0):
 
     return best_tour, best_distance
 
+# Cooling schedules for simulated_annealing: start(T0) once, then update() after every evaluation
+class GeometricCooling:
+    """T <- alpha * T after every evaluation."""
+
+    def __init__(self, alpha=0.9995, t_min=1e-9):
+        self.alpha = alpha
+        self.t_min = t_min
+
+    def start(self, T0):
+        return T0
+
+    def update(self, T, accepted, new_best):
+        return max(T * self.alpha, self.t_min)
+
+class AdaptiveCooling:
+    """Steers the acceptance rate down a target that decays over the run.
+
+    Every ``window`` evaluations the temperature is nudged up or down by
+    ``step`` depending on whether moves were accepted more or less often
+    than the current target.
+    """
+
+    def __init__(self, target=0.5, target_decay=0.99, window=200, step=1.05, t_min=1e-9):
+        self.target = target
+        self.target_decay = target_decay
+        self.window = window
+        self.step = step
+        self.t_min = t_min
+
+    def start(self, T0):
+        self.current_target = self.target
+        self.seen = 0
+        self.accepted = 0
+        return T0
+
+    def update(self, T, accepted, new_best):
+        self.seen += 1
+        self.accepted += accepted
+        if self.seen < self.window:
+            return T
+        rate = self.accepted / self.seen
+        self.seen = self.accepted = 0
+        self.current_target *= self.target_decay
+        T = T / self.step if rate > self.current_target else T * self.step
+        return max(T, self.t_min)
+
+class ReheatingCooling(GeometricCooling):
+    """Geometric cooling that reheats after ``patience`` evaluations without a new best."""
+
+    def __init__(self, alpha=0.9995, patience=20000, reheat=0.5, t_min=1e-9):
+        super().__init__(alpha, t_min)
+        self.patience = patience
+        self.reheat = reheat
+
+    def start(self, T0):
+        self.T0 = T0
+        self.stale = 0
+        return T0
+
+    def update(self, T, accepted, new_best):
+        self.stale = 0 if new_best else self.stale + 1
+        if self.stale >= self.patience:
+            self.stale = 0
+            return self.T0 * self.reheat
+        return super().update(T, accepted, new_best)
+
+COOLING_SCHEDULES = {
+    "geometric": GeometricCooling,
+    "adaptive": AdaptiveCooling,
+    "reheating": ReheatingCooling,
+}
+
+def initial_temperature(state, neighbors, samples=200, acceptance=0.5):
+    """Temperature at which an average uphill move is accepted with the given probability."""
+    uphill = [delta for delta, _ in (random_move(state, neighbors) for _ in range(samples)) if delta > 0]
+    if not uphill:
+        return 1.0
+    return -(sum(uphill) / len(uphill)) / math.log(acceptance)
+
+def simulated_annealing(problem=None, schedule="geometric", time_budget=None, max_evaluations=None,
+                        T0=None, candidates=8, tour=None):
+    """Simulated annealing over candidate-list 2-opt/Or-opt moves.
+
+    Runs until ``time_budget`` seconds have passed or ``max_evaluations``
+    moves have been priced, whichever comes first. ``schedule`` is a name
+    from COOLING_SCHEDULES or a schedule object.
+
+    Returns ``(best_tour, best_distance, trace)``. The trace is a list of
+    ``(seconds, evaluations, best_distance)`` points, one per new best plus
+    a final point, so runs can be compared by quality per second or per
+    evaluation.
+    """
+    if time_budget is None and max_evaluations is None:
+        raise ValueError("simulated_annealing needs a time_budget or max_evaluations")
+    problem = problem or default_problem
+    if isinstance(schedule, str):
+        schedule = COOLING_SCHEDULES[schedule]()
+    if tour is None:
+        tour = list(range(problem.n))
+        random.shuffle(tour)
+
+    started = time.perf_counter()
+    deadline = started + time_budget if time_budget is not None else float('inf')
+    max_evaluations = max_evaluations if max_evaluations is not None else float('inf')
+
+    state = TourState(tour, problem)
+    neighbors = problem.candidates(candidates)
+    current = problem.tour_length(state.tour)
+    best_distance = current
+    best_tour = list(state.tour)
+    at_best = True  # the current tour is the best one, not yet copied since
+    T = schedule.start(T0 if T0 is not None else initial_temperature(state, neighbors))
+    trace = [(0.0, 0, best_distance)]
+
+    evaluations = 0
+    while evaluations < max_evaluations:
+        # Reading the clock is slow next to one move, so only check it every 256
+        if evaluations & 255 == 0 and time.perf_counter() >= deadline:
+            break
+        evaluations += 1
+        delta, apply = random_move(state, neighbors)
+        accepted = delta < 0 or (T > 0 and random.random() < math.exp(-delta / T))
+        new_best = False
+        if accepted and delta:
+            if delta > 0 and at_best:
+                best_tour = list(state.tour)  # save the best tour only when leaving it
+                at_best = False
+            apply()
+            current += delta
+            if current < best_distance - 1e-12:
+                best_distance = current
+                at_best = True
+                new_best = True
+                trace.append((time.perf_counter() - started, evaluations, best_distance))
+        T = schedule.update(T, accepted, new_best)
+
+    if at_best:
+        best_tour = list(state.tour)
+    best_distance = problem.tour_length(best_tour)  # drop accumulated rounding
+    trace.append((time.perf_counter() - started, evaluations, best_distance))
+    return best_tour, best_distance, trace
+
 # Run multiple experiments
-def run_experiments(num_runs, max_iterations):
+def run_experiments(num_runs, max_iterations, problem=None, neighborhood="swap"):
     hc_results = []
     shc_results = []
 
     for _ in range(num_runs):
-        hc_tour, hc_dist = hill_climbing(max_iterations)
+        hc_tour, hc_dist = hill_climbing(max_iterations, problem, neighborhood)
         hc_results.append((hc_tour, hc_dist))
 
-        shc_tour, shc_dist = stochastic_hill_climbing(max_iterations)
+        shc_tour, shc_dist = stochastic_hill_climbing(max_iterations, problem=problem, neighborhood=neighborhood)
         shc_results.append((shc_tour, shc_dist))
 
     return hc_results, shc_results
 
+class ExperimentStats:
+    """compute_stats-style aggregate that is updated one trial at a time.
+
+    Trials may arrive in any order; they are keyed by trial index so the
+    result does not depend on which worker finished first.
+    """
+
+    def __init__(self, label):
+        self.label = label
+        self.distances = {}
+        self.best_distance = float('inf')
+        self.best_index = None
+        self.best_tour = None
+
+    def add(self, index, tour, distance):
+        self.distances[index] = distance
+        if distance < self.best_distance or (distance == self.best_distance and index < self.best_index):
+            self.best_distance = distance
+            self.best_index = index
+            self.best_tour = tour
+
+    @property
+    def average(self):
+        # fsum is exactly rounded, so arrival order cannot change the result
+        return math.fsum(self.distances.values()) / len(self.distances)
+
+    def report(self):
+        """Print and return the same summary as compute_stats."""
+        distances = [self.distances[i] for i in sorted(self.distances)]
+        success_rate = sum(1 for d in distances if d <= self.best_distance + 0.1) / len(distances) * 100
+
+        print(f"\n{self.label}:")
+        print(f"Average Tour Distance: {self.average:.4f}")
+        print(f"Best Tour Distance: {self.best_distance:.4f}")
+        print(f"Success Rate (within 0.1 of best): {success_rate:.2f}%")
+
+        return distances, self.best_distance, self.best_tour
+
+# Worker state for run_experiments_parallel, set once per process
+_problem = None
+
+def _init_worker(problem):
+    global _problem
+    _problem = problem
+
+def _run_trial(trial):
+    algorithm, index, seed, max_iterations, neighborhood = trial
+    random.seed(seed)
+    if algorithm == "hc":
+        tour, dist = hill_climbing(max_iterations, _problem, neighborhood)
+    else:
+        tour, dist = stochastic_hill_climbing(max_iterations, problem=_problem, neighborhood=neighborhood)
+    return algorithm, index, tour, dist
+
+def trial_seed(master_seed, algorithm, index):
+    # String seeds are hashed with SHA-512, so this is stable across processes and runs
+    return random.Random(f"{master_seed}:{algorithm}:{index}").getrandbits(64)
+
+def run_experiments_parallel(num_runs, max_iterations, problem=None, neighborhood="swap",
+                             master_seed=0, processes=None):
+    """run_experiments on a process pool, reproducible for a given master_seed.
+
+    Every trial reseeds from ``trial_seed(master_seed, algorithm, index)``,
+    so the outcome is the same for any number of workers. Results are
+    folded into two ExperimentStats (HC, SHC) as they complete.
+    """
+    problem = problem or default_problem
+    trials = [(algorithm, i, trial_seed(master_seed, algorithm, i), max_iterations, neighborhood)
+              for i in range(num_runs) for algorithm in ("hc", "shc")]
+    stats = {"hc": ExperimentStats("Hill Climbing"), "shc": ExperimentStats("Stochastic Hill Climbing")}
+
+    with multiprocessing.Pool(processes, _init_worker, (problem,)) as pool:
+        for algorithm, index, tour, dist in pool.imap_unordered(_run_trial, trials):
+            stats[algorithm].add(index, tour, dist)
+
+    return stats["hc"], stats["shc"]
+
 # Compute statistics and find the best tour
 def compute_stats(results, label):
     distances = [r[1] for r in results]
@@ -97,7 +669,13 @@ def compute_stats(results, label):
     return distances, best_distance, best_tour
 
 # Plot comparison graphs
-def plot_comparison(hc_distances, shc_distances, hc_best_tour, shc_best_tour, best_distance):
+def plot_comparison(hc_distances, shc_distances, hc_best_tour, shc_best_tour, best_distance, problem=None):
+    # Imported here so runs that never plot don't pay for matplotlib/seaborn start-up
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    num_cities = (problem or default_problem).n
+
     # Plot 1: Histogram of tour distances
     plt.figure(figsize=(10, 6))
     plt.hist(hc_distances, bins=10, alpha=0.5, label="Hill Climbing", color="blue")
@@ -105,7 +683,7 @@ def plot_comparison(hc_distances, shc_distances, hc_best_tour, shc_best_tour, be
     plt.axvline(best_distance, color="red", linestyle="--", label=f"Best Distance ({best_distance:.2f})")
     plt.xlabel("Tour Distance")
     plt.ylabel("Frequency")
-    plt.title(f"Comparison of HC and SHC for TSP ({len(cities)} Cities) - Histogram")
+    plt.title(f"Comparison of HC and SHC for TSP ({num_cities} Cities) - Histogram")
     plt.legend()
     plt.grid(True, linestyle='--', alpha=0.5)
     plt.savefig("tsp_histogram_5cities.png", format="png", dpi=300)
@@ -116,7 +694,7 @@ def plot_comparison(hc_distances, shc_distances, hc_best_tour, shc_best_tour, be
     sns.boxplot(data=[hc_distances, shc_distances], palette=["blue", "orange"])
     plt.xticks([0, 1], ["Hill Climbing", "Stochastic Hill Climbing"])
     plt.ylabel("Tour Distance")
-    plt.title(f"Comparison of HC and SHC for TSP ({len(cities)} Cities) - Boxplot")
+    plt.title(f"Comparison of HC and SHC for TSP ({num_cities} Cities) - Boxplot")
     plt.grid(True, linestyle='--', alpha=0.5)
     plt.savefig("tsp_boxplot_5cities.png", format="png", dpi=300)
     plt.close()
@@ -125,21 +703,49 @@ def plot_comparison(hc_distances, shc_distances, hc_best_tour, shc_best_tour, be
 
 # Main execution
 if __name__ == "__main__":
-    max_iterations = 1000
-    num_runs = 20
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare Hill Climbing and Stochastic Hill Climbing on a TSP.")
+    parser.add_argument("tsp", nargs="?", help="TSPLIB .tsp file (default: the 5 built-in cities)")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--neighborhood", choices=["swap", "2opt"], default="swap")
+    parser.add_argument("--seed", type=int, default=0, help="master seed for all trials")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--no-plot", action="store_true")
+    parser.add_argument("--anneal", type=float, metavar="SECONDS",
+                        help="also run simulated annealing for this many seconds per schedule")
+    parser.add_argument("--schedule", choices=list(COOLING_SCHEDULES), action="append",
+                        help="cooling schedule(s) for --anneal (default: all)")
+    args = parser.parse_args()
 
-    print(f"Running {num_runs} runs of Hill Climbing and Stochastic Hill Climbing with {max_iterations} iterations on {len(cities)} cities...")
+    max_iterations = args.iterations
+    num_runs = args.runs
+    problem = TSPProblem.from_tsplib(args.tsp) if args.tsp else default_problem
 
-    hc_results, shc_results = run_experiments(num_runs, max_iterations)
+    print(f"Running {num_runs} runs of Hill Climbing and Stochastic Hill Climbing with {max_iterations} iterations on {problem.n} cities...")
 
-    hc_distances, hc_best_dist, hc_best_tour = compute_stats(hc_results, "Hill Climbing")
-    shc_distances, shc_best_dist, shc_best_tour = compute_stats(shc_results, "Stochastic Hill Climbing")
+    hc_stats, shc_stats = run_experiments_parallel(num_runs, max_iterations, problem, args.neighborhood,
+                                                   args.seed, args.processes)
+
+    hc_distances, hc_best_dist, hc_best_tour = hc_stats.report()
+    shc_distances, shc_best_dist, shc_best_tour = shc_stats.report()
 
     # Print the best tours
     print("\nBest Tours:")
     print(f"HC Best Tour: {hc_best_tour}, Distance: {hc_best_dist:.4f}")
     print(f"SHC Best Tour: {shc_best_tour}, Distance: {shc_best_dist:.4f}")
 
+    if args.anneal:
+        print(f"\nSimulated Annealing ({args.anneal} s per schedule):")
+        for name in args.schedule or COOLING_SCHEDULES:
+            random.seed(trial_seed(args.seed, "sa-" + name, 0))
+            sa_tour, sa_dist, trace = simulated_annealing(problem, name, time_budget=args.anneal)
+            seconds, evaluations, _ = trace[-1]
+            print(f"{name:>9}: Distance: {sa_dist:.4f}, {evaluations} evaluations in {seconds:.2f} s, "
+                  f"{len(trace) - 2} improvements")
+
     # Plot the comparison
-    best_distance = min(hc_best_dist, shc_best_dist)
-    plot_comparison(hc_distances, shc_distances, hc_best_tour, shc_best_tour, best_distance)
+    if not args.no_plot:
+        best_distance = min(hc_best_dist, shc_best_dist)
+        plot_comparison(hc_distances, shc_distances, hc_best_tour, shc_best_tour, best_distance, problem)
@@ -1,5 +1,15 @@
+import heapq
+import multiprocessing
 import random
 import itertools
+import time
+from collections import deque
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # the pure-Python backend works without it
+    np = None
 
 def calculate_distance(route, distance_matrix):
     """Calculate the total distance of a given route."""
@@ -19,12 +29,159 @@ def generate_neighbors(route):
             neighbors.append(tuple(new_route))
     return neighbors
 
-def generate_initial_states(k, num_cities):
+def swap_delta(route, i, j, distance_matrix):
+    """Change in route distance from swapping positions i and j.
+
+    Only the (at most four) edges touching the two positions change, so
+    this is O(1) instead of re-measuring the whole route.
+    """
+    n = len(route)
+    a, b = route[i], route[j]
+
+    def city(p):
+        p %= n
+        return b if p == i else a if p == j else route[p]
+
+    delta = 0
+    for p in {(i - 1) % n, i, (j - 1) % n, j}:
+        delta += distance_matrix[city(p)][city(p + 1)]
+        delta -= distance_matrix[route[p]][route[(p + 1) % n]]
+    return delta
+
+def best_swaps(beam, distances, k, distance_matrix):
+    """The k best swap neighbors of the whole beam as (distance, route) pairs.
+
+    Every swap is scored by its delta and only the k winners are turned
+    into new routes; heapq.nsmallest keeps generation order among ties,
+    just like a stable sort followed by [:k].
+    """
+    def candidates():
+        for route, distance in zip(beam, distances):
+            n = len(route)
+            for i in range(n):
+                for j in range(i + 1, n):
+                    yield distance + swap_delta(route, i, j, distance_matrix), route, i, j
+
+    best = []
+    for distance, route, i, j in heapq.nsmallest(k, candidates(), key=lambda c: c[0]):
+        new_route = list(route)
+        new_route[i], new_route[j] = new_route[j], new_route[i]
+        best.append((distance, tuple(new_route)))
+    return best
+
+@lru_cache(maxsize=None)
+def _delta_positions(n):
+    """The positions swap_delta visits for each pair of ``np.triu_indices(n, 1)``, in its order.
+
+    swap_delta walks a set of small ints, whose order only depends on
+    their values, so it is worked out once per n. Unused slots (when i and
+    j are adjacent) are -1.
+    """
+    I, J = np.triu_indices(n, 1)
+    positions = np.full((len(I), 4), -1)
+    for row, (i, j) in enumerate(zip(I.tolist(), J.tolist())):
+        visited = list({(i - 1) % n, i, (j - 1) % n, j})
+        positions[row, :len(visited)] = visited
+    return positions
+
+def best_swaps_numpy(beam, distances, k, distance_matrix):
+    """Vectorized best_swaps over a (beam size x n) integer array.
+
+    All swap deltas of every beam member are computed in one batch of
+    array operations and the k best are picked with argpartition. Ties are
+    ordered by (member, i, j) exactly like the pure-Python backend, and each
+    delta adds up the same terms in the same order as ``swap_delta``, so
+    both backends make the same moves on float distances too. Returns
+    ``(distances, beam)`` arrays.
+    """
+    matrix = np.asarray(distance_matrix)
+    beam = np.asarray(beam)
+    distances = np.asarray(distances)
+    n = beam.shape[1]
+    I, J = np.triu_indices(n, 1)
+
+    positions = _delta_positions(n)
+    used = positions >= 0
+    positions = np.where(used, positions, 0)
+    a, b = beam[:, I], beam[:, J]
+
+    def swapped(p):
+        return np.where(p == I, b, np.where(p == J, a, beam[:, p]))
+
+    zero = np.zeros((), dtype=matrix.dtype)
+    delta = np.zeros((len(beam), len(I)), dtype=matrix.dtype)
+    for slot in range(positions.shape[1]):
+        p = positions[:, slot]
+        q = (p + 1) % n
+        # Same additions in the same order as swap_delta, so float sums match bit for bit
+        delta = delta + np.where(used[:, slot], matrix[swapped(p), swapped(q)], zero)
+        delta = delta - np.where(used[:, slot], matrix[beam[:, p], beam[:, q]], zero)
+
+    candidates = (distances[:, None] + delta).ravel()
+    count = min(k, candidates.size)
+    if count == 0:
+        return candidates[:0], beam[:0]
+    kth = candidates[np.argpartition(candidates, count - 1)[count - 1]]
+    # argpartition splits ties at the cut arbitrarily; keep the earliest ones
+    chosen = np.flatnonzero(candidates < kth)
+    ties = np.flatnonzero(candidates == kth)[:count - len(chosen)]
+    chosen = np.concatenate([chosen, ties])
+    chosen = chosen[np.lexsort((chosen, candidates[chosen]))]
+
+    member, pair = np.divmod(chosen, len(I))
+    new_beam = beam[member].copy()
+    rows = np.arange(count)
+    new_beam[rows, I[pair]], new_beam[rows, J[pair]] = new_beam[rows, J[pair]], new_beam[rows, I[pair]]
+    return candidates[chosen], new_beam
+
+def canonical_tour(route, symmetric=True):
+    """Normal form of a cyclic tour: start at the lowest city and, for
+    symmetric distances, run in the direction of the smaller neighbor.
+
+    Rotations (and, if symmetric, reversals) of a tour share one form.
+    """
+    start = route.index(min(route))
+    tour = tuple(route[start:]) + tuple(route[:start])
+    if symmetric and len(tour) > 2 and tour[-1] < tour[1]:
+        tour = tour[:1] + tour[:0:-1]
+    return tour
+
+def is_symmetric(distance_matrix):
+    n = len(distance_matrix)
+    return all(distance_matrix[i][j] == distance_matrix[j][i] for i in range(n) for j in range(i + 1, n))
+
+def select_distinct(step, k, symmetric=True, tabu=()):
+    """Pick the k best candidates that are distinct tours and not tabu.
+
+    ``step(limit)`` must return the ``limit`` best (distance, route) pairs
+    in order. The limit grows until k distinct tours are found or the
+    neighborhood runs out, so the usual case costs a single step.
+    """
+    limit = k
+    while True:
+        scored = step(limit)
+        picked = []
+        seen = set()
+        for distance, route in scored:
+            key = canonical_tour(route, symmetric)
+            if key in seen or key in tabu:
+                continue
+            seen.add(key)
+            picked.append((distance, route))
+            if len(picked) == k:
+                return picked
+        if len(scored) < limit:
+            return picked
+        limit *= 4
+
+def generate_initial_states(k, num_cities, rng=random):
     """Generate k random initial states (random routes)."""
     cities = list(range(num_cities))
-    return [tuple(random.sample(cities, len(cities))) for _ in range(k)]
+    return [tuple(rng.sample(cities, len(cities))) for _ in range(k)]
 
-def local_beam_search(k, initial_states, distance_matrix, max_iterations=100):
+def local_beam_search(k, initial_states, distance_matrix, max_iterations=100, backend="python",
+                      distinct=True, tabu_size=0, verbose=False, deadline=None, trace=None,
+                      patience=None):
     """
     Performs local beam search for the Traveling Salesperson Problem (TSP).
     
@@ -33,57 +190,144 @@ def local_beam_search(k, initial_states, distance_matrix, max_iterations=100):
     initial_states: List of k randomly generated initial states.
     distance_matrix: Matrix containing distances between cities.
     max_iterations: Maximum number of iterations to run.
+    backend: "python" (reference) or "numpy" (vectorized, needs NumPy).
+    distinct: Keep only one copy of each tour (up to rotation/reversal) in the beam.
+    tabu_size: Number of recent beam tours that may not re-enter the beam.
+    verbose: Print the beam at every iteration.
+    deadline: time.monotonic() value after which no new iteration starts
+        (the first one always runs, so there is always a route).
+    trace: Optional list; (iteration, seconds elapsed, best distance) is
+        appended each time the best route improves.
+    patience: Stop after this many iterations without a better route.
     
     Returns:
     The best route found and the iteration it was found in.
     """
+    log = print if verbose else (lambda *args, **kwargs: None)
+    started = time.monotonic()
     beam = initial_states  # Start with k random routes
+    distances = [calculate_distance(route, distance_matrix) for route in beam]
     best_route = None
     best_distance = float('inf')
     best_iteration = -1
     
-    print("Initial routes:")
-    for route in beam:
-        print(route, "Distance:", -evaluate(route, distance_matrix))
+    log("Initial routes:")
+    for route, distance in zip(beam, distances):
+        log(route, "Distance:", distance)
+    
+    if backend == "numpy":
+        if np is None:
+            raise ImportError("the numpy backend requires NumPy")
+        matrix = np.asarray(distance_matrix)
+    
+    def step(limit):
+        if backend == "numpy":
+            new_distances, new_beam = best_swaps_numpy(np.array(beam), np.array(distances), limit, matrix)
+            return list(zip(new_distances.tolist(), map(tuple, new_beam.tolist())))
+        return best_swaps(beam, distances, limit, distance_matrix)
+    
+    symmetric = is_symmetric(distance_matrix)
+    tabu = set()
+    recent = deque()
     
     for iteration in range(max_iterations):
-        print(f"\nIteration {iteration + 1}:")
-        all_neighbors = []
-        for route in beam:
-            neighbors = generate_neighbors(route)
-            all_neighbors.extend(neighbors)
+        if iteration and deadline is not None and time.monotonic() >= deadline:
+            log("\nTime budget exhausted.")
+            break
+        if patience is not None and iteration - best_iteration >= patience:
+            log(f"\nNo improvement in {patience} iterations.")
+            break
+        log(f"\nIteration {iteration + 1}:")
+        if distinct or tabu_size:
+            scored = select_distinct(step, k, symmetric, tabu)
+        else:
+            scored = step(k)
+        if not scored:
+            log("No unvisited neighbors left.")
+            break
+        distances = [distance for distance, _ in scored]
+        beam = [route for _, route in scored]
         
-        all_neighbors.sort(key=lambda r: evaluate(r, distance_matrix), reverse=True)
-        beam = all_neighbors[:k]
+        if tabu_size:
+            for route in beam:
+                key = canonical_tour(route, symmetric)
+                if key not in tabu:
+                    tabu.add(key)
+                    recent.append(key)
+            while len(recent) > tabu_size:
+                tabu.discard(recent.popleft())
         
-        print("Top candidates after sorting:")
-        for i, route in enumerate(beam):
-            print(f"Route {i + 1}: {route} Distance: {-evaluate(route, distance_matrix)}")
+        log("Top candidates after sorting:")
+        for i, (route, distance) in enumerate(zip(beam, distances)):
+            log(f"Route {i + 1}: {route} Distance: {distance}")
         
-        if -evaluate(beam[0], distance_matrix) < best_distance:
-            best_distance = -evaluate(beam[0], distance_matrix)
+        if distances[0] < best_distance:
+            best_distance = distances[0]
             best_route = beam[0]
             best_iteration = iteration + 1
+            if trace is not None:
+                trace.append((best_iteration, time.monotonic() - started, best_distance))
         
         if best_iteration == 0:
-            print(f"\nOptimal solution found at iteration {best_iteration}!")
+            log(f"\nOptimal solution found at iteration {best_iteration}!")
             return best_route, best_iteration
     
-    print(f"\nBest route after max iterations (Iteration {best_iteration}):")
+    log(f"\nBest route after max iterations (Iteration {best_iteration}):")
     return best_route, best_iteration
 
-# Example distance matrix (symmetric, 5 cities)
-distance_matrix = [
-    [0, 10, 15, 20, 25],
-    [10, 0, 35, 25, 30],
-    [15, 35, 0, 30, 20],
-    [20, 25, 30, 0, 15],
-    [25, 30, 20, 15, 0]
-]
-
-num_cities = len(distance_matrix)
-k = 3
-initial_states = generate_initial_states(k, num_cities)
-
-best_route, best_iteration = local_beam_search(k, initial_states, distance_matrix)
-print("Best route found:", best_route, "at iteration", best_iteration, "with distance", -evaluate(best_route, distance_matrix))
+# Worker state for solve_parallel, set once per process
+_matrix = None
+
+def _init_worker(distance_matrix):
+    global _matrix
+    _matrix = distance_matrix
+
+def _run_beam(config):
+    k, seed, max_iterations, wall_deadline, options = config
+    deadline = time.monotonic() + (wall_deadline - time.time())
+    rng = random.Random(seed)
+    initial_states = generate_initial_states(k, len(_matrix), rng)
+    trace = []
+    route, _ = local_beam_search(k, initial_states, _matrix, max_iterations,
+                                 deadline=deadline, trace=trace, **options)
+    distance = calculate_distance(route, _matrix) if route else float('inf')
+    return {"k": k, "seed": seed, "route": route, "distance": distance, "trace": trace}
+
+def solve_parallel(distance_matrix, beams, time_budget=None, max_iterations=100,
+                   processes=None, **options):
+    """Run independent beams on a process pool and keep the best tour.
+
+    ``beams`` is a list of ``(k, seed)`` pairs. All beams share one
+    wall-clock ``time_budget`` in seconds; each stops starting new
+    iterations once it is spent, so with more beams than processes the
+    later ones only get whatever budget is left. Extra keyword options are passed on to
+    local_beam_search.
+
+    Returns ``(best_route, best_distance, runs)`` where ``runs`` holds one
+    dict per beam with its k, seed, final route, distance and convergence
+    trace of (iteration, seconds, best distance).
+    """
+    wall_deadline = time.time() + time_budget if time_budget is not None else float('inf')
+    configs = [(k, seed, max_iterations, wall_deadline, options) for k, seed in beams]
+    with multiprocessing.Pool(processes, _init_worker, (distance_matrix,)) as pool:
+        runs = pool.map(_run_beam, configs, chunksize=1)
+
+    best = min(runs, key=lambda run: run["distance"])
+    return best["route"], best["distance"], runs
+
+if __name__ == "__main__":
+    # Example distance matrix (symmetric, 5 cities)
+    distance_matrix = [
+        [0, 10, 15, 20, 25],
+        [10, 0, 35, 25, 30],
+        [15, 35, 0, 30, 20],
+        [20, 25, 30, 0, 15],
+        [25, 30, 20, 15, 0]
+    ]
+
+    num_cities = len(distance_matrix)
+    k = 3
+    initial_states = generate_initial_states(k, num_cities)
+
+    best_route, best_iteration = local_beam_search(k, initial_states, distance_matrix, verbose=True)
+    print("Best route found:", best_route, "at iteration", best_iteration, "with distance", -evaluate(best_route, distance_matrix))
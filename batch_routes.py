@@ -0,0 +1,108 @@
+import csv
+import multiprocessing
+import sys
+
+from A_star1 import SEARCH_MODES, build_romania_graph
+
+# Per-worker state, set once by _init_worker and shared by every task
+_search = None
+_with_paths = False
+
+
+def _init_worker(graph, graph_path, mode, with_paths):
+    global _search, _with_paths
+    if graph is None:
+        if graph_path is None:
+            graph = build_romania_graph()
+        else:
+            from graph_loader import open_graph
+            graph = open_graph(graph_path)
+    _with_paths = with_paths
+
+    if mode == "alt":
+        from landmarks import alt_a_star, load_or_build_landmarks
+        landmarks = load_or_build_landmarks(graph, graph_path)
+        _search = lambda source, goal: alt_a_star(graph, source, goal, landmarks)
+    else:
+        search = SEARCH_MODES[mode]
+        _search = lambda source, goal: search(graph, source, goal)
+
+
+def _route(pair):
+    path, distance, _ = _search(*pair)
+    return pair[0], pair[1], distance, (path if _with_paths else None)
+
+
+def route_batch(pairs, graph=None, graph_path=None, mode="a_star", processes=None,
+                chunksize=256, with_paths=False):
+    """Answer ``(source, goal)`` id pairs on a process pool.
+
+    Results are yielded in input order as ``(source, goal, distance, path)``;
+    ``path`` is ``None`` unless ``with_paths`` is set. Workers get the graph
+    once when they start rather than with every task: a ``graph_path`` is
+    memory-mapped by each worker, so all of them share the same page cache,
+    and an in-memory ``graph`` is inherited on fork or pickled once per
+    worker elsewhere.
+    """
+    if mode == "alt" and graph_path is not None:
+        # Build the landmark file up front so workers only ever open it.
+        from graph_loader import open_graph
+        from landmarks import load_or_build_landmarks
+        load_or_build_landmarks(open_graph(graph_path), graph_path)
+
+    if graph_path is not None:
+        graph = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context()
+
+    with context.Pool(processes, _init_worker, (graph, graph_path, mode, with_paths)) as pool:
+        yield from pool.imap(_route, pairs, chunksize)
+
+
+def read_pairs(path, graph):
+    """Read ``source,goal`` rows of node names from a CSV file."""
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            if not row or row[0].startswith("#"):
+                continue
+            source, goal = row[0].strip(), row[1].strip()
+            if source not in graph.index or goal not in graph.index:
+                if source.lower() == "source":
+                    continue  # header row
+                raise ValueError(f"unknown node in pair {source!r}, {goal!r}")
+            yield graph.index[source], graph.index[goal]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compute many routes on a process pool.")
+    parser.add_argument("pairs", help="CSV file of source,goal node names")
+    parser.add_argument("--graph", help="binary graph file (default: the Romania map)")
+    parser.add_argument("--output", help="CSV file to write (default: stdout)")
+    parser.add_argument("--mode", default="a_star", choices=list(SEARCH_MODES) + ["alt"])
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=256)
+    parser.add_argument("--paths", action="store_true", help="also write each path")
+    args = parser.parse_args()
+
+    if args.graph:
+        from graph_loader import open_graph
+        graph = open_graph(args.graph)
+    else:
+        graph = build_romania_graph()
+
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    writer = csv.writer(out)
+    writer.writerow(["source", "goal", "distance"] + (["path"] if args.paths else []))
+    results = route_batch(read_pairs(args.pairs, graph), graph, args.graph, args.mode,
+                          args.processes, args.chunksize, args.paths)
+    for source, goal, distance, path in results:
+        row = [graph.names[source], graph.names[goal], distance]
+        if args.paths:
+            row.append(" -> ".join(graph.names[u] for u in path) if path else "")
+        writer.writerow(row)
+    if out is not sys.stdout:
+        out.close()
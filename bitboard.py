@@ -0,0 +1,322 @@
+import random
+from array import array
+from math import inf
+
+# Cell (row, col) of a 3x3 board is bit 3 * row + col; each player owns one mask
+SIZE = 3
+FULL = (1 << SIZE * SIZE) - 1
+
+
+def line_masks(rows, cols, k):
+    """Masks of every run of ``k`` cells in a row, column or diagonal of a rows x cols board."""
+    masks = []
+    for row in range(rows):
+        for col in range(cols):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row, end_col = row + dr * (k - 1), col + dc * (k - 1)
+                if 0 <= end_row < rows and 0 <= end_col < cols:
+                    mask = 0
+                    for i in range(k):
+                        mask |= 1 << ((row + dr * i) * cols + col + dc * i)
+                    masks.append(mask)
+    return tuple(masks)
+
+
+LINES = line_masks(SIZE, SIZE, SIZE)
+
+# WINS[mask] is 1 when the cells in mask complete a line, so a win check is one lookup
+WINS = bytearray(1 << SIZE * SIZE)
+for _mask in range(len(WINS)):
+    WINS[_mask] = any(_mask & line == line for line in LINES)
+del _mask
+
+
+def symmetries(size=SIZE):
+    """The 8 rotations and reflections of a square board as cell permutations."""
+    maps = (
+        lambda r, c: (r, c), lambda r, c: (c, size - 1 - r),
+        lambda r, c: (size - 1 - r, size - 1 - c), lambda r, c: (size - 1 - c, r),
+        lambda r, c: (r, size - 1 - c), lambda r, c: (c, r),
+        lambda r, c: (size - 1 - r, c), lambda r, c: (size - 1 - c, size - 1 - r),
+    )
+    perms = []
+    for f in maps:
+        perm = [0] * (size * size)
+        for r in range(size):
+            for c in range(size):
+                new_r, new_c = f(r, c)
+                perm[r * size + c] = new_r * size + new_c
+        perms.append(tuple(perm))
+    return tuple(perms)
+
+
+SYMMETRIES = symmetries()
+INVERSE_SYMMETRIES = tuple(tuple(perm.index(i) for i in range(len(perm))) for perm in SYMMETRIES)
+
+# Zobrist keys: ZOBRIST[color][index] holds the key of a stone of that color
+# on cell index under each of the 8 symmetries, so all 8 hashes of a
+# position are updated together by one move.
+_rng = random.Random(0x5EED)
+_keys = [[_rng.getrandbits(64) for _ in range(SIZE * SIZE)] for _ in range(2)]
+ZOBRIST = tuple(tuple(tuple(_keys[color][perm[index]] for perm in SYMMETRIES)
+                      for index in range(SIZE * SIZE)) for color in range(2))
+SIDE_TO_MOVE = _rng.getrandbits(64)
+del _rng, _keys
+
+EXACT, LOWER, UPPER = 1, 2, 3
+
+
+def zobrist(me, opp, color):
+    """The 8 symmetric hashes of a position where ``color`` (0 or 1) owns ``me`` and is to move."""
+    hashes = [SIDE_TO_MOVE if color else 0] * len(SYMMETRIES)
+    for mask, stone_color in ((me, color), (opp, 1 - color)):
+        for index in moves(mask):
+            hashes = [h ^ k for h, k in zip(hashes, ZOBRIST[stone_color][index])]
+    return tuple(hashes)
+
+
+class SearchStats:
+    """Node and transposition table counters for one or more searches."""
+
+    def __init__(self):
+        self.nodes = 0
+        self.probes = 0
+        self.hits = 0
+        self.cutoffs = 0
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def report(self, label):
+        print(f"{label}: {self.nodes} nodes, {self.probes} probes, "
+              f"{self.hit_rate:.1%} hit rate, {self.cutoffs} cutoffs")
+
+
+class TranspositionTable:
+    """Fixed-size hash table of search results, indexed by the low bits of a key.
+
+    Each slot holds a value with its bound type (EXACT, LOWER or UPPER),
+    the depth it was searched to and the best move, all in flat arrays.
+    With ``policy="depth"`` a slot is only overwritten by a result searched
+    at least as deep, or by the same position; ``"always"`` keeps the
+    newest result.
+    """
+
+    def __init__(self, size=1 << 16, policy="depth"):
+        if size & (size - 1):
+            raise ValueError("transposition table size must be a power of two")
+        if policy not in ("depth", "always"):
+            raise ValueError(f"unknown replacement policy {policy!r}")
+        self.size = size
+        self.policy = policy
+        self.keys = array('Q', [0]) * size
+        self.values = array('d', [0]) * size
+        self.depths = bytearray(size)
+        self.flags = bytearray(size)  # 0 marks an empty slot
+        self.moves = bytearray(size)
+        self.stores = 0
+        self.overwrites = 0
+
+    def __len__(self):
+        return sum(1 for flag in self.flags if flag)
+
+    def clear(self):
+        self.flags = bytearray(self.size)
+
+    def probe(self, key):
+        """Slot holding ``key``, or -1."""
+        slot = key & (self.size - 1)
+        if self.flags[slot] and self.keys[slot] == key:
+            return slot
+        return -1
+
+    def store(self, key, depth, flag, value, move):
+        slot = key & (self.size - 1)
+        if self.flags[slot] and self.keys[slot] != key:
+            if self.policy == "depth" and depth < self.depths[slot]:
+                return
+            self.overwrites += 1
+        self.keys[slot] = key
+        self.values[slot] = value
+        self.depths[slot] = depth
+        self.flags[slot] = flag
+        self.moves[slot] = move
+        self.stores += 1
+
+
+def cell(row, col):
+    return row * SIZE + col
+
+
+def row_col(index):
+    return divmod(index, SIZE)
+
+
+def mask_of(board, player):
+    """Bitmask of the cells of a list-of-rows board that hold ``player``."""
+    mask = 0
+    for row in range(SIZE):
+        for col in range(SIZE):
+            if board[row][col] == player:
+                mask |= 1 << cell(row, col)
+    return mask
+
+
+def moves(free):
+    """Indices of the set bits of ``free``, lowest first (row-major order)."""
+    while free:
+        low = free & -free
+        yield low.bit_length() - 1
+        free ^= low
+
+
+def alpha_beta(me, opp, alpha=-inf, beta=inf, stats=None):
+    """Negamax alpha-beta over bitboards, ``me`` being the side to move.
+
+    Returns ``(score, index)`` from the point of view of ``me``: 1 for a
+    win, -1 for a loss, 0 for a draw. Moves are tried in row-major order
+    and the first best one is kept, so the result matches the list-based
+    searches it replaces.
+    """
+    if stats is not None:
+        stats.nodes += 1
+    if WINS[opp]:
+        return -1, None
+    if WINS[me]:
+        return 1, None
+    free = FULL & ~(me | opp)
+    if not free:
+        return 0, None
+
+    best_score = -inf
+    best_move = None
+    for index in moves(free):
+        score = -alpha_beta(opp, me | (1 << index), -beta, -alpha, stats)[0]
+        if score > best_score:
+            best_score = score
+            best_move = index
+        alpha = max(alpha, score)
+        if beta <= alpha:
+            break
+    return best_score, best_move
+
+
+def _table_search(me, opp, color, hashes, alpha, beta, table, stats):
+    """Negamax below the root, memoized in ``table`` under the canonical hash."""
+    stats.nodes += 1
+    if WINS[opp]:
+        return -1
+    free = FULL & ~(me | opp)
+    if not free:
+        return 0
+
+    # The smallest of the 8 symmetric hashes names the whole symmetry class
+    key = min(hashes)
+    symmetry = hashes.index(key)
+    depth = bin(free).count("1")
+    stats.probes += 1
+    slot = table.probe(key)
+    first = None
+    if slot >= 0:
+        stats.hits += 1
+        if table.depths[slot] >= depth:
+            value, flag = table.values[slot], table.flags[slot]
+            if flag == EXACT or (flag == LOWER and value >= beta) or (flag == UPPER and value <= alpha):
+                stats.cutoffs += 1
+                return value
+        first = INVERSE_SYMMETRIES[symmetry][table.moves[slot]]
+
+    original_alpha = alpha
+    best_score = -inf
+    best_move = 0
+    order = moves(free)
+    if first is not None and free >> first & 1:
+        order = (first, *(index for index in moves(free) if index != first))
+    zobrist_color = ZOBRIST[color]
+    for index in order:
+        child = tuple(h ^ k ^ SIDE_TO_MOVE for h, k in zip(hashes, zobrist_color[index]))
+        score = -_table_search(opp, me | (1 << index), 1 - color, child, -beta, -alpha, table, stats)
+        if score > best_score:
+            best_score = score
+            best_move = index
+        alpha = max(alpha, score)
+        if beta <= alpha:
+            break
+
+    if best_score <= original_alpha:
+        flag = UPPER
+    elif best_score >= beta:
+        flag = LOWER
+    else:
+        flag = EXACT
+    table.store(key, depth, flag, best_score, SYMMETRIES[symmetry][best_move])
+    return best_score
+
+
+def table_alpha_beta(me, opp, alpha=-inf, beta=inf, table=None, stats=None):
+    """``alpha_beta`` with a transposition table shared across calls.
+
+    Positions are keyed by a Zobrist hash updated move by move and reduced
+    to one key per symmetry class, so rotations and reflections of a
+    position share an entry. The root always tries its moves in row-major
+    order and is never answered from the table, so the chosen move is the
+    same as without it.
+    """
+    if table is None:
+        return alpha_beta(me, opp, alpha, beta, stats)
+    if stats is None:
+        stats = SearchStats()
+    stats.nodes += 1
+    if WINS[opp]:
+        return -1, None
+    if WINS[me]:
+        return 1, None
+    free = FULL & ~(me | opp)
+    if not free:
+        return 0, None
+
+    color = int(bin(me).count("1") != bin(opp).count("1"))  # 0 when me moved first
+    hashes = zobrist(me, opp, color)
+    best_score = -inf
+    best_move = None
+    for index in moves(free):
+        child = tuple(h ^ k ^ SIDE_TO_MOVE for h, k in zip(hashes, ZOBRIST[color][index]))
+        score = -_table_search(opp, me | (1 << index), 1 - color, child, -beta, -alpha, table, stats)
+        if score > best_score:
+            best_score = score
+            best_move = index
+        alpha = max(alpha, score)
+        if beta <= alpha:
+            break
+    return best_score, best_move
+
+
+def compare_search(positions, size=1 << 16, policy="depth"):
+    """Node counts and hit rates of plain and table-backed search over ``positions``.
+
+    ``positions`` are ``(me, opp)`` mask pairs searched one after another,
+    as in a game, with one table shared by all of them. Checks that both
+    searches agree and returns the two SearchStats.
+    """
+    plain, tabled = SearchStats(), SearchStats()
+    table = TranspositionTable(size, policy)
+    for me, opp in positions:
+        expected = alpha_beta(me, opp, stats=plain)
+        actual = table_alpha_beta(me, opp, table=table, stats=tabled)
+        if expected != actual:
+            raise AssertionError(f"table search returned {actual}, plain search {expected}")
+    plain.report("plain")
+    tabled.report("table")
+    return plain, tabled
+
+
+if __name__ == "__main__":
+    # Replay a perfectly played game and compare search effort move by move
+    me, opp = 0, 0
+    positions = []
+    while not (WINS[me] or WINS[opp]) and me | opp != FULL:
+        positions.append((me, opp))
+        _, index = alpha_beta(me, opp)
+        me, opp = opp, me | (1 << index)
+    compare_search(positions)
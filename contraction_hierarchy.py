@@ -0,0 +1,271 @@
+import heapq
+from array import array
+
+from A_star1 import INF, CSRGraph, typecode
+
+
+class ContractionHierarchy:
+    """Upward and downward search graphs of a contracted road graph.
+
+    ``up`` holds the edges ``u -> v`` with ``rank[v] > rank[u]``. ``down``
+    holds the edges ``u -> v`` with ``rank[u] > rank[v]``, stored reversed
+    at ``v`` so that the backward search also only climbs. ``up_middle``
+    and ``down_middle`` give the contracted node each shortcut bypasses,
+    or -1 for an original edge.
+    """
+
+    def __init__(self, names, rank, up, up_middle, down, down_middle):
+        self.names = names
+        self.rank = rank
+        self.up = up
+        self.up_middle = up_middle
+        self.down = down
+        self.down_middle = down_middle
+
+    @property
+    def num_nodes(self):
+        return len(self.rank)
+
+    def _edge(self, u, v):
+        """Weight and middle node of the hierarchy edge ``u -> v``."""
+        if self.rank[u] < self.rank[v]:
+            side, middles, at, other = self.up, self.up_middle, u, v
+        else:
+            side, middles, at, other = self.down, self.down_middle, v, u
+        for e in range(side.offsets[at], side.offsets[at + 1]):
+            if side.targets[e] == other:
+                return side.weights[e], middles[e]
+        raise KeyError((u, v))
+
+    def unpack(self, path):
+        """Replace every shortcut on ``path`` with the edges it stands for."""
+        result = [path[0]]
+        stack = [(path[i], path[i + 1]) for i in range(len(path) - 2, -1, -1)]
+        while stack:
+            u, v = stack.pop()
+            _, middle = self._edge(u, v)
+            if middle < 0:
+                result.append(v)
+            else:
+                stack.append((middle, v))
+                stack.append((u, middle))
+        return result
+
+
+def _witness_search(out_edges, contracted, source, avoid, max_cost, settle_limit):
+    """Bounded Dijkstra used to check whether a shortcut is needed."""
+    dist = {source: 0}
+    open_list = [(0, source)]
+    settled = 0
+    while open_list and settled < settle_limit:
+        d, u = heapq.heappop(open_list)
+        if d > dist[u]:
+            continue
+        if d > max_cost:
+            break
+        settled += 1
+        for v, (w, _) in out_edges[u].items():
+            if v == avoid or contracted[v]:
+                continue
+            new_cost = d + w
+            if new_cost < dist.get(v, INF):
+                dist[v] = new_cost
+                heapq.heappush(open_list, (new_cost, v))
+    return dist
+
+
+def build_contraction_hierarchy(graph, settle_limit=500):
+    """Contract every node of ``graph`` in edge-difference order.
+
+    Nodes are ordered by a lazily updated priority of
+    ``shortcuts added - edges removed + contracted neighbours``. Witness
+    searches settle at most ``settle_limit`` nodes; hitting the limit only
+    adds a redundant shortcut, never a wrong distance.
+    """
+    n = graph.num_nodes
+    out_edges = [{} for _ in range(n)]
+    in_edges = [{} for _ in range(n)]
+    for u in range(n):
+        for v, w in graph.neighbors(u):
+            if u != v and w < out_edges[u].get(v, (INF,))[0]:
+                out_edges[u][v] = (w, -1)
+                in_edges[v][u] = (w, -1)
+
+    contracted = bytearray(n)
+    deleted_neighbors = [0] * n
+    rank = array("i", [0]) * n
+    up_lists = [None] * n
+    down_lists = [None] * n
+
+    def shortcuts_for(v):
+        shortcuts = []
+        if not out_edges[v]:
+            return shortcuts
+        max_out = max(w for w, _ in out_edges[v].values())
+        for u, (w_in, _) in in_edges[v].items():
+            dist = _witness_search(out_edges, contracted, u, v, w_in + max_out, settle_limit)
+            for x, (w_out, _) in out_edges[v].items():
+                if x != u and dist.get(x, INF) > w_in + w_out:
+                    shortcuts.append((u, x, w_in + w_out))
+        return shortcuts
+
+    def priority(v):
+        return (len(shortcuts_for(v)) - len(in_edges[v]) - len(out_edges[v])
+                + deleted_neighbors[v])
+
+    queue = [(priority(v), v) for v in range(n)]
+    heapq.heapify(queue)
+    order = 0
+    while queue:
+        _, v = heapq.heappop(queue)
+        current = priority(v)
+        if queue and current > queue[0][0]:
+            heapq.heappush(queue, (current, v))
+            continue
+
+        for u, x, w in shortcuts_for(v):
+            if w < out_edges[u].get(x, (INF,))[0]:
+                out_edges[u][x] = (w, v)
+                in_edges[x][u] = (w, v)
+
+        # Every remaining neighbour is contracted later, so v's edges are final.
+        up_lists[v] = [(x, w, middle) for x, (w, middle) in out_edges[v].items()]
+        down_lists[v] = [(u, w, middle) for u, (w, middle) in in_edges[v].items()]
+        for x in out_edges[v]:
+            del in_edges[x][v]
+            deleted_neighbors[x] += 1
+        for u in in_edges[v]:
+            del out_edges[u][v]
+            deleted_neighbors[u] += 1
+        out_edges[v] = {}
+        in_edges[v] = {}
+
+        contracted[v] = 1
+        rank[v] = order
+        order += 1
+
+    weight_type = typecode(graph.weights)
+    up, up_middle = _search_graph(graph.names, up_lists, weight_type)
+    down, down_middle = _search_graph(graph.names, down_lists, weight_type)
+    return ContractionHierarchy(graph.names, rank, up, up_middle, down, down_middle)
+
+
+def _search_graph(names, edge_lists, weight_type):
+    offsets = array("q", [0])
+    targets = array("i")
+    weights = array(weight_type)
+    middles = array("i")
+    for edges in edge_lists:
+        for v, w, middle in edges:
+            targets.append(v)
+            weights.append(w)
+            middles.append(middle)
+        offsets.append(len(targets))
+    heuristics = array("q", [0]) * len(edge_lists)
+    return CSRGraph(names, offsets, targets, weights, heuristics), middles
+
+
+def _upward_search(graph, start):
+    """Distances to every node in ``start``'s upward search space."""
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    dist = {start: 0}
+    open_list = [(0, start)]
+    while open_list:
+        d, u = heapq.heappop(open_list)
+        if d > dist[u]:
+            continue
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            new_cost = d + weights[e]
+            if new_cost < dist.get(v, INF):
+                dist[v] = new_cost
+                heapq.heappush(open_list, (new_cost, v))
+    return dist
+
+
+def ch_query(ch, source, goal):
+    """Shortest path on a ContractionHierarchy.
+
+    Both searches only climb to higher-ranked nodes and all query state is
+    kept in dicts sized by the (small) search spaces. Returns
+    ``(path, distance, expanded)`` like ``csr_a_star``, with shortcuts
+    already unpacked into original edges.
+    """
+    if source == goal:
+        return [source], 0, 1
+
+    forward_dist, forward_parent = {}, {}
+    backward_dist, backward_parent = {}, {}
+    expanded = 0
+    best = INF
+    meeting = -1
+
+    forward = [(0, source)]
+    backward = [(0, goal)]
+    forward_dist[source] = 0
+    backward_dist[goal] = 0
+    sides = ((ch.up, forward, forward_dist, forward_parent, backward_dist),
+             (ch.down, backward, backward_dist, backward_parent, forward_dist))
+
+    turn = 0
+    while forward or backward:
+        if not sides[turn][1]:
+            turn = 1 - turn
+        graph, open_list, dist, parent, other_dist = sides[turn]
+        turn = 1 - turn
+
+        d, u = heapq.heappop(open_list)
+        if d > dist[u]:
+            continue
+        if d >= best:
+            open_list.clear()  # nothing left on this side can improve the route
+            continue
+        expanded += 1
+        if u in other_dist and d + other_dist[u] < best:
+            best = d + other_dist[u]
+            meeting = u
+
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            new_cost = d + weights[e]
+            if new_cost < dist.get(v, INF):
+                dist[v] = new_cost
+                parent[v] = u
+                heapq.heappush(open_list, (new_cost, v))
+
+    if meeting < 0:
+        return None, INF, expanded
+
+    path = [meeting]
+    while path[-1] != source:
+        path.append(forward_parent[path[-1]])
+    path.reverse()
+    node = meeting
+    while node != goal:
+        node = backward_parent[node]
+        path.append(node)
+    return ch.unpack(path), best, expanded
+
+
+def distance_table(ch, sources, goals):
+    """Many-to-many distances with bucket-based CH searches.
+
+    One backward upward search per goal fills per-node buckets, then one
+    forward upward search per source scans them, so the cost grows with
+    ``len(sources) + len(goals)`` searches instead of their product.
+    """
+    buckets = {}
+    for j, goal in enumerate(goals):
+        for v, d in _upward_search(ch.down, goal).items():
+            buckets.setdefault(v, []).append((j, d))
+
+    table = []
+    for source in sources:
+        row = [INF] * len(goals)
+        for v, d in _upward_search(ch.up, source).items():
+            for j, d_goal in buckets.get(v, ()):
+                if d + d_goal < row[j]:
+                    row[j] = d + d_goal
+        table.append(row)
+    return table
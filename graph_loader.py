@@ -0,0 +1,268 @@
+import csv
+import math
+import mmap
+import struct
+import sys
+from array import array
+
+from A_star1 import CSRGraph, typecode
+
+# Binary graph file layout (all sections native-endian, 8-byte aligned):
+#   header
+#   offsets        int64   [n + 1]
+#   targets        int32   [m]
+#   weights        int64 or float64 [m]
+#   heuristics     int64 or float64 [n]
+#   name_offsets   int64   [n + 1]
+#   name_blob      utf-8 bytes
+#   xs, ys         float64 [n] each, only when the graph has coordinates
+MAGIC = b"CSRG"
+VERSION = 1
+_HEADER = struct.Struct("<4sHccc?6xqq")
+
+
+class NameTable:
+    """Node names kept as one UTF-8 blob and decoded on access."""
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    @classmethod
+    def from_names(cls, names):
+        offsets = array("q", [0])
+        parts = []
+        for name in names:
+            encoded = str(name).encode("utf-8")
+            parts.append(encoded)
+            offsets.append(offsets[-1] + len(encoded))
+        return cls(offsets, b"".join(parts))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("node id out of range")
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+def _align(pos):
+    return (pos + 7) & ~7
+
+
+def write_graph(graph, path):
+    """Write a CSRGraph to ``path`` in the memory-mappable binary format."""
+    names = graph.names if isinstance(graph.names, NameTable) else NameTable.from_names(graph.names)
+    sections = [graph.offsets, graph.targets, graph.weights, graph.heuristics,
+                names.offsets, names.blob]
+    if graph.coords is not None:
+        sections.extend(graph.coords)
+
+    header = _HEADER.pack(MAGIC, VERSION, sys.byteorder[0].encode(),
+                          typecode(graph.weights).encode(),
+                          typecode(graph.heuristics).encode(),
+                          graph.coords is not None,
+                          graph.num_nodes, graph.num_edges)
+    with open(path, "wb") as f:
+        f.write(header)
+        pos = len(header)
+        for section in sections:
+            padding = _align(pos) - pos
+            f.write(b"\0" * padding)
+            data = memoryview(section).cast("B")
+            f.write(data)
+            pos += padding + len(data)
+
+
+def open_graph(path):
+    """Memory-map a graph written by ``write_graph``.
+
+    The returned graph's arrays are zero-copy views into the file, so
+    opening costs a header read regardless of graph size; pages are
+    loaded by the OS as searches touch them.
+    """
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buf = memoryview(mm)
+
+    magic, version, byteorder, weight_type, heuristic_type, has_coords, n, m = \
+        _HEADER.unpack_from(buf)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} graph file")
+    if byteorder.decode() != sys.byteorder[0]:
+        raise ValueError(f"{path} was written on a {byteorder.decode()!r}-endian machine")
+
+    pos = _HEADER.size
+
+    def take(code, count):
+        nonlocal pos
+        pos = _align(pos)
+        size = struct.calcsize(code) * count
+        view = buf[pos:pos + size].cast(code)
+        pos += size
+        return view
+
+    offsets = take("q", n + 1)
+    targets = take("i", m)
+    weights = take(weight_type.decode(), m)
+    heuristics = take(heuristic_type.decode(), n)
+    name_offsets = take("q", n + 1)
+    name_blob = take("B", name_offsets[n])
+    coords = (take("d", n), take("d", n)) if has_coords else None
+
+    return CSRGraph(NameTable(name_offsets, name_blob), offsets, targets,
+                    weights, heuristics, coords)
+
+
+def _number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _weight_array(values):
+    integral = all(isinstance(v, int) for v in values)
+    return array("q" if integral else "d", values)
+
+
+def read_csv(edges_path, heuristics_path=None, undirected=False):
+    """Load ``source,target,weight`` rows into a CSRGraph.
+
+    A header row is skipped if its weight column is not numeric. Node
+    names are assigned ids in order of first appearance. The optional
+    heuristics file holds ``node,heuristic`` rows.
+    """
+    index = {}
+    names = []
+    sources = array("i")
+    targets = array("i")
+    weights = []
+
+    def node_id(name):
+        if name not in index:
+            index[name] = len(names)
+            names.append(name)
+        return index[name]
+
+    with open(edges_path, newline="") as f:
+        for row_no, row in enumerate(csv.reader(f)):
+            if not row:
+                continue
+            try:
+                weight = _number(row[2])
+            except ValueError:
+                if row_no == 0:
+                    continue
+                raise
+            u, v = node_id(row[0].strip()), node_id(row[1].strip())
+            sources.append(u)
+            targets.append(v)
+            weights.append(weight)
+            if undirected:
+                sources.append(v)
+                targets.append(u)
+                weights.append(weight)
+
+    heuristics = None
+    if heuristics_path is not None:
+        values = [0] * len(names)
+        with open(heuristics_path, newline="") as f:
+            for row_no, row in enumerate(csv.reader(f)):
+                if not row:
+                    continue
+                try:
+                    value = _number(row[1])
+                except ValueError:
+                    if row_no == 0:
+                        continue
+                    raise
+                u = node_id(row[0].strip())
+                if u >= len(values):
+                    # A node that only appears in the heuristics file
+                    values.extend([0] * (u + 1 - len(values)))
+                values[u] = value
+        values.extend([0] * (len(names) - len(values)))
+        heuristics = _weight_array(values)
+
+    return CSRGraph.from_arrays(names, sources, targets, _weight_array(weights), heuristics)
+
+
+def read_dimacs(gr_path, co_path=None):
+    """Load a DIMACS shortest-path ``.gr`` file and optional ``.co`` file.
+
+    DIMACS ids are 1-based; node ``i`` in the file becomes id ``i - 1``
+    and keeps its original number as its name.
+    """
+    n = 0
+    sources = array("i")
+    targets = array("i")
+    weights = array("q")
+    with open(gr_path) as f:
+        for line in f:
+            if line.startswith("a "):
+                _, u, v, w = line.split()
+                sources.append(int(u) - 1)
+                targets.append(int(v) - 1)
+                weights.append(int(w))
+            elif line.startswith("p "):
+                n = int(line.split()[2])
+
+    coords = None
+    if co_path is not None:
+        xs = array("d", [0.0]) * n
+        ys = array("d", [0.0]) * n
+        with open(co_path) as f:
+            for line in f:
+                if line.startswith("v "):
+                    _, i, x, y = line.split()
+                    xs[int(i) - 1] = float(x)
+                    ys[int(i) - 1] = float(y)
+        coords = (xs, ys)
+
+    names = NameTable.from_names(range(1, n + 1))
+    return CSRGraph.from_arrays(names, sources, targets, weights, coords=coords)
+
+
+def euclidean_heuristics(graph, goal, scale=1.0):
+    """Straight-line distance to ``goal`` times ``scale`` for every node.
+
+    ``scale`` must convert coordinate units into a lower bound on edge
+    weight units for the heuristic to stay admissible.
+    """
+    xs, ys = graph.coords
+    gx, gy = xs[goal], ys[goal]
+    return array("d", (math.hypot(x - gx, y - gy) * scale for x, y in zip(xs, ys)))
+
+
+def convert(inputs, output, undirected=False):
+    """Convert a CSV or DIMACS edge list into a binary graph file."""
+    first = inputs[0]
+    if first.endswith(".gr"):
+        graph = read_dimacs(first, inputs[1] if len(inputs) > 1 else None)
+    else:
+        graph = read_csv(first, inputs[1] if len(inputs) > 1 else None, undirected)
+    write_graph(graph, output)
+    return graph
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert an edge list into a binary graph file.")
+    parser.add_argument("inputs", nargs="+",
+                        help="edges.csv [heuristics.csv] or graph.gr [graph.co]")
+    parser.add_argument("output", help="binary graph file to write")
+    parser.add_argument("--undirected", action="store_true",
+                        help="add the reverse of every CSV edge")
+    args = parser.parse_args()
+
+    graph = convert(args.inputs, args.output, args.undirected)
+    print(f"Wrote {graph.num_nodes} nodes and {graph.num_edges} edges to {args.output}")
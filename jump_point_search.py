@@ -0,0 +1,273 @@
+import heapq
+import math
+import random
+import time
+from array import array
+
+INF = float("inf")
+SQRT2 = math.sqrt(2)
+PASSABLE = b".GS"
+
+
+class GridMap:
+    """8-connected occupancy grid stored as one byte per cell.
+
+    ``cells[y * width + x]`` is 1 for a blocked cell and 0 for a free one.
+    A diagonal move is only allowed when both orthogonal cells it passes
+    are free, so paths never cut corners.
+    """
+
+    def __init__(self, width, height, cells=None):
+        self.width = width
+        self.height = height
+        self.cells = bytearray(width * height) if cells is None else cells
+
+    def free(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height and not self.cells[y * self.width + x]
+
+    def block(self, x, y):
+        self.cells[y * self.width + x] = 1
+
+    @classmethod
+    def from_rows(cls, rows, passable=PASSABLE):
+        height, width = len(rows), len(rows[0])
+        cells = bytearray(width * height)
+        for y, row in enumerate(rows):
+            for x, cell in enumerate(row.encode() if isinstance(row, str) else row):
+                if cell not in passable:
+                    cells[y * width + x] = 1
+        return cls(width, height, cells)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a map in the MovingAI ``.map`` format."""
+        with open(path, "rb") as f:
+            lines = f.read().split(b"\n")
+        start = next(i for i, line in enumerate(lines) if line.strip() == b"map") + 1
+        height = next(int(line.split()[1]) for line in lines if line.startswith(b"height"))
+        return cls.from_rows([line.rstrip(b"\r") for line in lines[start:start + height]])
+
+    @classmethod
+    def random(cls, width, height, density=0.2, seed=None):
+        rng = random.Random(seed)
+        cells = bytearray(1 if rng.random() < density else 0 for _ in range(width * height))
+        return cls(width, height, cells)
+
+    def neighbors(self, x, y):
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                if (dx or dy) and self.free(x + dx, y + dy):
+                    if dx and dy and not (self.free(x + dx, y) and self.free(x, y + dy)):
+                        continue
+                    yield x + dx, y + dy, SQRT2 if dx and dy else 1
+
+
+def octile(a, b):
+    dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+    return max(dx, dy) + (SQRT2 - 1) * min(dx, dy)
+
+
+def _interpolate(jump_points):
+    """Expand a list of jump points into every cell along the way."""
+    path = [jump_points[0]]
+    for (x1, y1) in jump_points[1:]:
+        x, y = path[-1]
+        dx = (x1 > x) - (x1 < x)
+        dy = (y1 > y) - (y1 < y)
+        while (x, y) != (x1, y1):
+            x, y = x + dx, y + dy
+            path.append((x, y))
+    return path
+
+
+def grid_a_star(grid, start, goal):
+    """Plain A* over every cell, the baseline for Jump Point Search.
+
+    Returns ``(path, distance, expanded)`` with ``path`` a list of
+    ``(x, y)`` cells, or ``None`` if the goal is unreachable.
+    """
+    width = grid.width
+    g = array("d", [INF]) * (width * grid.height)
+    parent = {}
+    g[start[1] * width + start[0]] = 0
+    open_list = [(octile(start, goal), 0, start)]
+    expanded = 0
+
+    while open_list:
+        _, g_u, u = heapq.heappop(open_list)
+        if g_u > g[u[1] * width + u[0]]:
+            continue
+        expanded += 1
+        if u == goal:
+            path = [u]
+            while path[-1] != start:
+                path.append(parent[path[-1]])
+            path.reverse()
+            return path, g_u, expanded
+
+        for x, y, cost in grid.neighbors(*u):
+            new_cost = g_u + cost
+            if new_cost < g[y * width + x]:
+                g[y * width + x] = new_cost
+                parent[(x, y)] = u
+                heapq.heappush(open_list, (new_cost + octile((x, y), goal), new_cost, (x, y)))
+
+    return None, INF, expanded
+
+
+def _jump(grid, x, y, dx, dy, goal):
+    """Walk from ``(x, y)`` in direction ``(dx, dy)`` to the next jump point."""
+    free = grid.free
+    while True:
+        x += dx
+        y += dy
+        if not free(x, y):
+            return None
+        if (x, y) == goal:
+            return x, y
+        if dx and dy:
+            if _jump(grid, x, y, dx, 0, goal) or _jump(grid, x, y, 0, dy, goal):
+                return x, y
+            if not (free(x + dx, y) and free(x, y + dy)):
+                return None
+        elif dx:
+            if ((free(x, y - 1) and not free(x - dx, y - 1))
+                    or (free(x, y + 1) and not free(x - dx, y + 1))):
+                return x, y
+        else:
+            if ((free(x - 1, y) and not free(x - 1, y - dy))
+                    or (free(x + 1, y) and not free(x + 1, y - dy))):
+                return x, y
+
+
+def _pruned_directions(grid, x, y, parent):
+    """Directions worth jumping in from ``(x, y)`` given how we got there."""
+    if parent is None:
+        return [(nx - x, ny - y) for nx, ny, _ in grid.neighbors(x, y)]
+
+    free = grid.free
+    dx = (x > parent[0]) - (x < parent[0])
+    dy = (y > parent[1]) - (y < parent[1])
+    directions = []
+    if dx and dy:
+        if free(x, y + dy):
+            directions.append((0, dy))
+        if free(x + dx, y):
+            directions.append((dx, 0))
+        if free(x + dx, y) and free(x, y + dy):
+            directions.append((dx, dy))
+    elif dx:
+        ahead = free(x + dx, y)
+        if ahead:
+            directions.append((dx, 0))
+        # Turning is only needed past an obstacle that hid the side cell, as in _jump
+        for side in (1, -1):
+            if free(x, y + side) and not free(x - dx, y + side):
+                directions.append((0, side))
+                if ahead:
+                    directions.append((dx, side))
+    else:
+        ahead = free(x, y + dy)
+        if ahead:
+            directions.append((0, dy))
+        for side in (1, -1):
+            if free(x + side, y) and not free(x + side, y - dy):
+                directions.append((side, 0))
+                if ahead:
+                    directions.append((side, dy))
+    return directions
+
+
+def jump_point_search(grid, start, goal):
+    """Optimal 8-connected path by Jump Point Search.
+
+    Only jump points enter the open list; the straight and diagonal runs
+    between them are skipped over. Returns the same
+    ``(path, distance, expanded)`` triple as ``grid_a_star``, with the path
+    expanded back to every cell it crosses.
+    """
+    if not grid.free(*start) or not grid.free(*goal):
+        return None, INF, 0
+
+    g = {start: 0}
+    parent = {start: None}
+    open_list = [(octile(start, goal), 0, start)]
+    expanded = 0
+
+    while open_list:
+        _, g_u, u = heapq.heappop(open_list)
+        if g_u > g[u]:
+            continue
+        expanded += 1
+        if u == goal:
+            jump_points = [u]
+            while parent[jump_points[-1]] is not None:
+                jump_points.append(parent[jump_points[-1]])
+            jump_points.reverse()
+            return _interpolate(jump_points), g_u, expanded
+
+        for dx, dy in _pruned_directions(grid, u[0], u[1], parent[u]):
+            point = _jump(grid, u[0], u[1], dx, dy, goal)
+            if point is None:
+                continue
+            new_cost = g_u + octile(u, point)
+            if new_cost < g.get(point, INF):
+                g[point] = new_cost
+                parent[point] = u
+                heapq.heappush(open_list, (new_cost + octile(point, goal), new_cost, point))
+
+    return None, INF, expanded
+
+
+def print_grid_path(path, distance):
+    """Print a cell path in the same format as ``A_star1.print_path``."""
+    if path is None:
+        print("No path found!")
+        return
+    print("Optimal Path:", " -> ".join(f"({x}, {y})" for x, y in path))
+    print("Total Distance:", round(distance, 4))
+
+
+def benchmark(grid, queries=100, seed=0):
+    """Time plain A* and JPS on the same random start/goal pairs."""
+    rng = random.Random(seed)
+    free_cells = [(x, y) for y in range(grid.height) for x in range(grid.width) if grid.free(x, y)]
+    pairs = [(rng.choice(free_cells), rng.choice(free_cells)) for _ in range(queries)]
+
+    results = {}
+    for name, search in (("A*", grid_a_star), ("JPS", jump_point_search)):
+        expanded = 0
+        distances = []
+        began = time.perf_counter()
+        for start, goal in pairs:
+            _, distance, count = search(grid, start, goal)
+            expanded += count
+            distances.append(distance)
+        results[name] = (time.perf_counter() - began, expanded, distances)
+
+    for a, b in zip(results["A*"][2], results["JPS"][2]):
+        if not (a == b or abs(a - b) < 1e-6):
+            raise AssertionError(f"JPS distance {b} differs from A* distance {a}")
+
+    print(f"{queries} queries on a {grid.width}x{grid.height} grid")
+    for name, (seconds, expanded, _) in results.items():
+        print(f"{name:>4}: {seconds:.3f} s, {expanded} nodes expanded")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark Jump Point Search against A*.")
+    parser.add_argument("map", nargs="?", help="MovingAI .map file (default: random grid)")
+    parser.add_argument("--size", type=int, default=256)
+    parser.add_argument("--density", type=float, default=0.2)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.map:
+        grid = GridMap.from_file(args.map)
+    else:
+        grid = GridMap.random(args.size, args.size, args.density, args.seed)
+    benchmark(grid, args.queries, args.seed)
@@ -0,0 +1,181 @@
+import mmap
+import os
+import struct
+from array import array
+
+from A_star1 import INF, bidirectional_a_star, csr_a_star, shortest_path_tree
+
+# Landmark file layout: header, landmark ids (int32 [k]), then the
+# distances from and to every landmark (float64 [n * k] each), stored
+# node-major so one node's k values sit next to each other.
+MAGIC = b"ALTL"
+VERSION = 1
+_HEADER = struct.Struct("<4sH2xqq")
+
+
+class LandmarkHeuristic:
+    """Triangle-inequality lower bound on the distance to (or from) one node.
+
+    For a landmark L, ``d(v, t) >= d(L, t) - d(L, v)`` and
+    ``d(v, t) >= d(v, L) - d(t, L)``; the bound is the best of these over
+    all landmarks. With ``reverse=True`` it bounds ``d(t, v)`` instead,
+    which is what the backward half of a bidirectional search needs.
+    """
+
+    def __init__(self, landmarks, node, reverse=False):
+        k = landmarks.k
+        row = slice(node * k, (node + 1) * k)
+        self.k = k
+        if reverse:
+            self.first, self.second = landmarks.to_dist, landmarks.from_dist
+        else:
+            self.first, self.second = landmarks.from_dist, landmarks.to_dist
+        self.node_first = list(self.first[row])
+        self.node_second = list(self.second[row])
+
+    def __getitem__(self, v):
+        k = self.k
+        base = v * k
+        first, second = self.first, self.second
+        best = 0
+        for i in range(k):
+            a, b = self.node_first[i], first[base + i]
+            if a < INF and b < INF and a - b > best:
+                best = a - b
+            a, b = second[base + i], self.node_second[i]
+            if a < INF and b < INF and a - b > best:
+                best = a - b
+        return best
+
+
+class Landmarks:
+    """Exact distances between K landmarks and every node of a graph."""
+
+    def __init__(self, ids, from_dist, to_dist):
+        self.ids = ids
+        self.from_dist = from_dist  # from_dist[v * k + i] = d(landmark i, v)
+        self.to_dist = to_dist      # to_dist[v * k + i] = d(v, landmark i)
+
+    @property
+    def k(self):
+        return len(self.ids)
+
+    @property
+    def num_nodes(self):
+        return len(self.from_dist) // self.k if self.k else 0
+
+    def heuristic(self, goal):
+        return LandmarkHeuristic(self, goal)
+
+    def source_heuristic(self, source):
+        return LandmarkHeuristic(self, source, reverse=True)
+
+
+def select_landmarks(graph, k, start=0):
+    """Pick ``k`` landmarks by farthest-first selection.
+
+    Each new landmark is the reachable node farthest from the ones already
+    chosen, which spreads them towards the edges of the graph where their
+    bounds are tightest.
+    """
+    k = min(k, graph.num_nodes)
+    nearest = array("d", [INF]) * graph.num_nodes
+    chosen = []
+    candidate = start
+    while len(chosen) < k:
+        chosen.append(candidate)
+        dist, _ = shortest_path_tree(graph, candidate)
+        for v in range(graph.num_nodes):
+            if dist[v] < nearest[v]:
+                nearest[v] = dist[v]
+
+        candidate, far = -1, -1
+        for v in range(graph.num_nodes):
+            if far < nearest[v] < INF:
+                candidate, far = v, nearest[v]
+        if far <= 0:
+            # Everything reachable is already a landmark; fall back to
+            # nodes the earlier landmarks cannot reach.
+            unreached = [v for v in range(graph.num_nodes) if nearest[v] == INF]
+            if not unreached:
+                break
+            candidate = unreached[0]
+    return chosen
+
+
+def build_landmarks(graph, k=8, start=0):
+    ids = select_landmarks(graph, k, start)
+    k = len(ids)
+    n = graph.num_nodes
+    from_dist = array("d", [INF]) * (n * k)
+    to_dist = array("d", [INF]) * (n * k)
+    reverse = graph.reversed()
+    for i, landmark in enumerate(ids):
+        forward, _ = shortest_path_tree(graph, landmark)
+        backward, _ = shortest_path_tree(reverse, landmark)
+        for v in range(n):
+            from_dist[v * k + i] = forward[v]
+            to_dist[v * k + i] = backward[v]
+    return Landmarks(array("i", ids), from_dist, to_dist)
+
+
+def write_landmarks(landmarks, path):
+    n = landmarks.num_nodes
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, n, landmarks.k))
+        f.write(landmarks.ids.tobytes())
+        if landmarks.k % 2:
+            f.write(b"\0" * 4)  # keep the float sections 8-byte aligned
+        f.write(memoryview(landmarks.from_dist).cast("B"))
+        f.write(memoryview(landmarks.to_dist).cast("B"))
+
+
+def open_landmarks(path):
+    """Memory-map a landmark file written by ``write_landmarks``."""
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buf = memoryview(mm)
+    magic, version, n, k = _HEADER.unpack_from(buf)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} landmark file")
+
+    pos = _HEADER.size
+    ids = buf[pos:pos + 4 * k].cast("i")
+    pos += 4 * k + (4 if k % 2 else 0)
+    from_dist = buf[pos:pos + 8 * n * k].cast("d")
+    pos += 8 * n * k
+    to_dist = buf[pos:pos + 8 * n * k].cast("d")
+    return Landmarks(ids, from_dist, to_dist)
+
+
+def landmark_path(graph_path):
+    return graph_path + ".alt"
+
+
+def load_or_build_landmarks(graph, graph_path=None, k=8):
+    """Open the landmark tables stored next to ``graph_path``, or build them.
+
+    Freshly built tables are written to ``<graph_path>.alt`` so that later
+    processes only pay for the mmap.
+    """
+    if graph_path is not None:
+        path = landmark_path(graph_path)
+        if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(graph_path):
+            landmarks = open_landmarks(path)
+            if landmarks.num_nodes == graph.num_nodes and landmarks.k == min(k, graph.num_nodes):
+                return landmarks
+
+    landmarks = build_landmarks(graph, k)
+    if graph_path is not None:
+        write_landmarks(landmarks, landmark_path(graph_path))
+    return landmarks
+
+
+def alt_a_star(graph, source, goal, landmarks):
+    """A* guided by the landmark lower bound (ALT)."""
+    return csr_a_star(graph, source, goal, landmarks.heuristic(goal))
+
+
+def alt_bidirectional(graph, source, goal, landmarks):
+    return bidirectional_a_star(graph, source, goal, landmarks.heuristic(goal),
+                                landmarks.source_heuristic(source))
@@ -3,6 +3,12 @@ import pygame
 import platform
 from math import inf
 
+from bitboard import FULL, WINS, TranspositionTable, cell, moves, row_col
+from perfect_play import load_table, lookup_or_search
+
+# Perfect-play table, memory-mapped once at startup (None if it has not been built)
+PERFECT_PLAY = load_table()
+
 # Pygame setup
 pygame.init()
 WIDTH, HEIGHT = 300, 300
@@ -27,6 +33,7 @@ font = pygame.font.SysFont("arial", FONT_SIZE)
 class TicTacToe:
     def __init__(self):
         self.board = [[' ' for _ in range(3)] for _ in range(3)]
+        self.bits = {'X': 0, 'O': 0}  # bitboard of each player's cells, kept in step with board
         self.current_player = 'X'
         self.game_over = False
         self.winner = None
@@ -67,74 +74,49 @@ class TicTacToe:
         pygame.draw.circle(screen, O_COLOR, (center_x, center_y), radius, LINE_WIDTH)
 
     def is_winner(self, player):
-        for row in self.board:
-            if all(cell == player for cell in row):
-                return True
-        for col in range(3):
-            if all(self.board[row][col] == player for row in range(3)):
-                return True
-        if all(self.board[i][i] == player for i in range(3)):
-            return True
-        if all(self.board[i][2 - i] == player for i in range(3)):
-            return True
-        return False
+        return bool(WINS[self.bits[player]])
+
+    def free_cells(self):
+        return FULL & ~(self.bits['X'] | self.bits['O'])
 
     def is_draw(self):
-        return all(cell != ' ' for row in self.board for cell in row) and not self.is_winner('X') and not self.is_winner('O')
+        return not self.free_cells() and not self.is_winner('X') and not self.is_winner('O')
 
     def is_terminal(self):
-        return self.is_winner('X') or self.is_winner('O') or self.is_draw()
+        return self.is_winner('X') or self.is_winner('O') or not self.free_cells()
 
     def get_empty_cells(self):
-        return [(i, j) for i in range(3) for j in range(3) if self.board[i][j] == ' ']
+        return [row_col(index) for index in moves(self.free_cells())]
 
     def make_move(self, row, col, player):
         if self.board[row][col] == ' ':
             self.board[row][col] = player
+            self.bits[player] |= 1 << cell(row, col)
             return True
         return False
 
     def undo_move(self, row, col):
+        player = self.board[row][col]
+        if player != ' ':
+            self.bits[player] &= ~(1 << cell(row, col))
         self.board[row][col] = ' '
 
-def minimax(game, player, alpha=-inf, beta=inf):
-    if game.is_terminal():
-        if game.is_winner('X'):
-            return 1, None
-        if game.is_winner('O'):
-            return -1, None
-        return 0, None
+def minimax(game, player, alpha=-inf, beta=inf, table=None, stats=None, book=PERFECT_PLAY):
+    """Score (1 = X wins, -1 = O wins) and best (row, col) for ``player`` to move.
 
+    Positions in the perfect-play ``book`` are answered by one lookup. The
+    rest are searched on the game's bitboards, through ``table`` when one
+    is given; see bitboard.table_alpha_beta.
+    """
     if player == 'X':
-        best_score = -inf
-        best_move = None
-        for row, col in game.get_empty_cells():
-            game.make_move(row, col, 'X')
-            score, _ = minimax(game, 'O', alpha, beta)
-            game.undo_move(row, col)
-            if score > best_score:
-                best_score = score
-                best_move = (row, col)
-            alpha = max(alpha, best_score)
-            if beta <= alpha:
-                break
-        return best_score, best_move
+        score, index = lookup_or_search(game.bits['X'], game.bits['O'], alpha, beta, book, table, stats)
     else:
-        best_score = inf
-        best_move = None
-        for row, col in game.get_empty_cells():
-            game.make_move(row, col, 'O')
-            score, _ = minimax(game, 'X', alpha, beta)
-            game.undo_move(row, col)
-            if score < best_score:
-                best_score = score
-                best_move = (row, col)
-            beta = min(beta, best_score)
-            if beta <= alpha:
-                break
-        return best_score, best_move
+        score, index = lookup_or_search(game.bits['O'], game.bits['X'], -beta, -alpha, book, table, stats)
+        score = -score
+    return score, (None if index is None else row_col(index))
 
 async def main():
+    table = TranspositionTable()
     game = TicTacToe()
     game.draw_board()
 
@@ -151,7 +133,7 @@ async def main():
             continue
 
         if game.current_player == 'X':
-            _, move = minimax(game, 'X')
+            _, move = minimax(game, 'X', table=table)
             if move:
                 row, col = move
                 game.make_move(row, col, 'X')
@@ -0,0 +1,242 @@
+import time
+from array import array
+from math import inf
+
+from bitboard import line_masks, moves
+
+WIN = 1_000_000  # score of a win on the spot; wins further away score a little less
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class MNKGame:
+    """An m,n,k game (k in a row on a rows x cols board) on two bitboards.
+
+    Cell ``row * cols + col`` is one bit of each player's mask. For every
+    line of k cells the game keeps how many stones each player has on it,
+    updated by ``play`` and ``undo``, which gives both the win test and the
+    open-line evaluation without rescanning the board.
+    """
+
+    def __init__(self, rows, cols, k, radius=2):
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.cells = rows * cols
+        self.full = (1 << self.cells) - 1
+        self.lines = line_masks(rows, cols, k)
+        through = [[] for _ in range(self.cells)]
+        for i, line in enumerate(self.lines):
+            for cell in moves(line):
+                through[cell].append(i)
+        self.through = [tuple(ids) for ids in through]
+        # Moves are only generated within ``radius`` of a stone
+        self.near = []
+        for cell in range(self.cells):
+            row, col = divmod(cell, cols)
+            mask = 0
+            for r in range(max(0, row - radius), min(rows, row + radius + 1)):
+                for c in range(max(0, col - radius), min(cols, col + radius + 1)):
+                    mask |= 1 << (r * cols + c)
+            self.near.append(mask)
+        # A line with n > 0 stones of one player only is worth 4 ** n to that player
+        self.weights = [0] + [4 ** n for n in range(1, k + 1)]
+
+        self.bits = [0, 0]
+        self.counts = [array('b', [0]) * len(self.lines), array('b', [0]) * len(self.lines)]
+        self.to_move = 0
+        self.score = 0  # open-line balance from player 0's point of view
+        self.played = []  # (cell, won) for every move played
+
+    def _line_value(self, i):
+        first, second = self.counts[0][i], self.counts[1][i]
+        if second == 0:
+            return self.weights[first]
+        if first == 0:
+            return -self.weights[second]
+        return 0
+
+    def play(self, cell):
+        player = self.to_move
+        counts = self.counts[player]
+        won = False
+        for i in self.through[cell]:
+            self.score -= self._line_value(i)
+            counts[i] += 1
+            self.score += self._line_value(i)
+            if counts[i] == self.k:
+                won = True
+        self.bits[player] |= 1 << cell
+        self.to_move = 1 - player
+        self.played.append((cell, won))
+
+    def undo(self):
+        cell, _ = self.played.pop()
+        player = 1 - self.to_move
+        counts = self.counts[player]
+        for i in self.through[cell]:
+            self.score -= self._line_value(i)
+            counts[i] -= 1
+            self.score += self._line_value(i)
+        self.bits[player] &= ~(1 << cell)
+        self.to_move = player
+
+    @property
+    def last_won(self):
+        """Whether the last move completed a line."""
+        return bool(self.played) and self.played[-1][1]
+
+    def free(self):
+        return self.full & ~(self.bits[0] | self.bits[1])
+
+    def evaluate(self):
+        """Open-line balance from the side to move's point of view."""
+        return self.score if self.to_move == 0 else -self.score
+
+    def candidates(self):
+        """Empty cells near a stone, or the centre cell on an empty board."""
+        occupied = self.bits[0] | self.bits[1]
+        if not occupied:
+            return [(self.rows // 2) * self.cols + self.cols // 2]
+        near = 0
+        for cell in moves(occupied):
+            near |= self.near[cell]
+        return list(moves(near & ~occupied))
+
+    def print_board(self):
+        for row in range(self.rows):
+            cells = []
+            for col in range(self.cols):
+                bit = 1 << (row * self.cols + col)
+                cells.append("X" if self.bits[0] & bit else "O" if self.bits[1] & bit else ".")
+            print(" ".join(cells))
+        print()
+
+
+class MNKSearch:
+    """Iterative-deepening alpha-beta for MNKGame under a wall-clock budget.
+
+    Each iteration is the negamax of ``bitboard.alpha_beta`` cut off at a
+    depth limit, where the open-line evaluation stands in for the result.
+    Moves are ordered by the previous iteration's principal variation,
+    then two killer moves per ply, then the history heuristic. When time
+    runs out the best move of the deepest finished iteration is returned,
+    or of the unfinished one if it already found a better root move.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.history = array('q', [0]) * game.cells
+        self.killers = []
+        self.lines = []
+        self.previous_pv = []
+        self.nodes = 0
+        self.deadline = inf
+
+    def _ordered(self, ply):
+        candidates = self.game.candidates()
+        history = self.history
+        candidates.sort(key=lambda cell: -history[cell])
+        first = []
+        if ply < len(self.previous_pv) and self.previous_pv[ply] in candidates:
+            first.append(self.previous_pv[ply])
+        for killer in self.killers[ply]:
+            if killer is not None and killer not in first and killer in candidates:
+                first.append(killer)
+        return first + [cell for cell in candidates if cell not in first]
+
+    def _negamax(self, depth, ply, alpha, beta):
+        game = self.game
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and time.perf_counter() >= self.deadline:
+            raise SearchTimeout
+        self.lines[ply] = []
+        if game.last_won:
+            return -(WIN - ply)
+        if not game.free():
+            return 0
+        if depth == 0:
+            return game.evaluate()
+
+        best_score = -inf
+        for cell in self._ordered(ply):
+            game.play(cell)
+            try:
+                score = -self._negamax(depth - 1, ply + 1, -beta, -alpha)
+            finally:
+                game.undo()
+            if score > best_score:
+                best_score = score
+            if score > alpha:
+                alpha = score
+                self.lines[ply] = [cell] + self.lines[ply + 1]
+            if beta <= alpha:
+                killers = self.killers[ply]
+                if cell != killers[0]:
+                    killers[1] = killers[0]
+                    killers[0] = cell
+                self.history[cell] += depth * depth
+                break
+        return best_score
+
+    def search(self, time_budget=1.0, max_depth=None):
+        """Best move within ``time_budget`` seconds.
+
+        Returns ``(move, score, depth, pv)``: the move, its score for the
+        side to move, the deepest finished iteration and its principal
+        variation. ``self.nodes`` counts the nodes visited.
+        """
+        game = self.game
+        empty = bin(game.free()).count("1")
+        max_depth = min(max_depth or empty, empty)
+        self.deadline = time.perf_counter() + time_budget
+        self.nodes = 0
+        self.killers = [[None, None] for _ in range(max_depth + 2)]
+        self.lines = [[] for _ in range(max_depth + 2)]
+        self.previous_pv = []
+
+        candidates = game.candidates()
+        best = (candidates[0] if candidates else None, -inf, 0, [])
+        for depth in range(1, max_depth + 1):
+            try:
+                score = self._negamax(depth, 0, -inf, inf)
+            except SearchTimeout:
+                # Anything this iteration already prefers beat the previous best move
+                if self.lines[0] and self.lines[0][0] != best[0]:
+                    best = (self.lines[0][0], best[1], best[2], self.lines[0])
+                break
+            self.previous_pv = self.lines[0]
+            best = (self.lines[0][0], score, depth, self.lines[0])
+            if abs(score) >= WIN - max_depth:
+                break  # forced result, deeper search cannot change it
+        return best
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Self-play an m,n,k game with iterative deepening.")
+    parser.add_argument("--rows", type=int, default=15)
+    parser.add_argument("--cols", type=int, default=15)
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--time", type=float, default=1.0, help="seconds per move")
+    parser.add_argument("--moves", type=int, default=None, help="stop after this many moves")
+    args = parser.parse_args()
+
+    game = MNKGame(args.rows, args.cols, args.k)
+    search = MNKSearch(game)
+    played = 0
+    while game.free() and not game.last_won and (args.moves is None or played < args.moves):
+        move, score, depth, pv = search.search(args.time)
+        row, col = divmod(move, game.cols)
+        player = "XO"[game.to_move]
+        print(f"{player} plays ({row}, {col}): score {score}, depth {depth}, {search.nodes} nodes")
+        game.play(move)
+        played += 1
+    game.print_board()
+    if game.last_won:
+        print(f"{'XO'[1 - game.to_move]} wins!")
+    elif not game.free():
+        print("It's a draw!")
@@ -0,0 +1,129 @@
+import mmap
+import os
+import struct
+from math import inf
+
+from bitboard import FULL, SIZE, TranspositionTable, moves, table_alpha_beta
+
+# Table file layout: header, then one byte per board in base-3 order
+# (cell i is 0 empty, 1 X, 2 O, weighted by 3 ** i). A byte holds the
+# side to move's score + 1 in bits 4-5 and its best cell in bits 0-3,
+# or UNKNOWN for boards that cannot come up in a game.
+MAGIC = b"TTTP"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHI")
+NO_MOVE = 0x0F
+UNKNOWN = 0xFF
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tictactoe.table")
+
+CELLS = SIZE * SIZE
+# BASE3[mask] is the base-3 weight of the cells in mask, so a board is BASE3[x] + 2 * BASE3[o]
+BASE3 = tuple(sum(3 ** i for i in moves(mask)) for mask in range(FULL + 1))
+
+
+def board_index(x, o):
+    return BASE3[x] + 2 * BASE3[o]
+
+
+def build_table():
+    """Solve every reachable position from the empty board.
+
+    Each position gets the score and move ``table_alpha_beta`` returns for
+    the side to move, so answers from the table match the search.
+    """
+    entries = bytearray([UNKNOWN]) * 3 ** CELLS
+    transpositions = TranspositionTable()
+    stack = [(0, 0)]
+    while stack:
+        x, o = stack.pop()
+        index = board_index(x, o)
+        if entries[index] != UNKNOWN:
+            continue
+        x_to_move = bin(x).count("1") == bin(o).count("1")
+        me, opp = (x, o) if x_to_move else (o, x)
+        score, move = table_alpha_beta(me, opp, table=transpositions)
+        entries[index] = int(score + 1) << 4 | (NO_MOVE if move is None else move)
+        if move is not None:
+            for cell in moves(FULL & ~(x | o)):
+                stack.append((x | 1 << cell, o) if x_to_move else (x, o | 1 << cell))
+    return entries
+
+
+def write_table(entries, path=DEFAULT_PATH):
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, SIZE, len(entries)))
+        f.write(entries)
+
+
+class PerfectPlayTable:
+    """Score and best move of every reachable position, looked up by board index."""
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    def lookup(self, me, opp):
+        """``(score, index)`` like ``alpha_beta`` for ``me`` to move, or None if unknown.
+
+        Only positions where ``me`` is really the side to move are stored.
+        """
+        me_count, opp_count = bin(me).count("1"), bin(opp).count("1")
+        if me_count == opp_count:
+            entry = self.entries[board_index(me, opp)]
+        elif me_count + 1 == opp_count:
+            entry = self.entries[board_index(opp, me)]
+        else:
+            return None
+        if entry == UNKNOWN:
+            return None
+        move = entry & 0x0F
+        return (entry >> 4) - 1, (None if move == NO_MOVE else move)
+
+
+def open_table(path=DEFAULT_PATH):
+    """Memory-map a table written by ``write_table``."""
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, size, count = _HEADER.unpack_from(mm)
+    if magic != MAGIC or version != VERSION or size != SIZE or count != 3 ** CELLS:
+        raise ValueError(f"{path} is not a version {VERSION} {SIZE}x{SIZE} perfect-play table")
+    return PerfectPlayTable(memoryview(mm)[_HEADER.size:_HEADER.size + count])
+
+
+def load_table(path=DEFAULT_PATH):
+    """``open_table``, building and writing the table first if the file does not exist.
+
+    If it cannot be written (e.g. a read-only install) the freshly built
+    table is used from memory.
+    """
+    if not os.path.exists(path):
+        entries = build_table()
+        try:
+            write_table(entries, path)
+        except OSError:
+            return PerfectPlayTable(entries)
+    return open_table(path)
+
+
+def lookup_or_search(me, opp, alpha=-inf, beta=inf, book=None, table=None, stats=None):
+    """Answer from the perfect-play ``book`` when it knows the position, else search.
+
+    ``table`` and ``stats`` are passed on to ``table_alpha_beta``.
+    """
+    if book is not None:
+        answer = book.lookup(me, opp)
+        if answer is not None:
+            return answer
+    return table_alpha_beta(me, opp, alpha, beta, table, stats)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the tic-tac-toe perfect-play table.")
+    parser.add_argument("output", nargs="?", default=DEFAULT_PATH)
+    args = parser.parse_args()
+
+    entries = build_table()
+    write_table(entries, args.output)
+    known = sum(1 for entry in entries if entry != UNKNOWN)
+    print(f"Wrote {known} positions ({len(entries)} bytes) to {args.output}")
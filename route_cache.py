@@ -0,0 +1,117 @@
+import threading
+from collections import OrderedDict
+
+from A_star1 import INF, csr_a_star, shortest_path_tree
+
+_ROUTE_OVERHEAD = 64  # rough per-entry cost of a cached point-to-point route
+_TREE_NODE_BYTES = 8 + 4  # distance (double) and parent (int) of every node in a tree
+
+
+class RouteCache:
+    """LRU cache of shortest-path trees and routes over one CSRGraph.
+
+    Goals that are asked for ``tree_after`` times get a full reverse
+    shortest-path tree, after which every source is answered by walking
+    parent pointers. Other queries are cached as point-to-point routes.
+    Both kinds share one LRU order and a ``memory_budget`` in bytes. A
+    tree that could never fit in the budget is not built; its goal stays
+    on point-to-point routes and is counted in ``trees_skipped``.
+    """
+
+    def __init__(self, graph, memory_budget=64 << 20, tree_after=3, search=csr_a_star):
+        self.graph = graph
+        self.memory_budget = memory_budget
+        self.tree_after = tree_after
+        self.search = search
+        self.entries = OrderedDict()  # key -> (value, size in bytes)
+        self.memory_used = 0
+        self.goal_counts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.trees_skipped = 0
+        self._lock = threading.Lock()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "trees_skipped": self.trees_skipped,
+            "entries": len(self.entries),
+            "memory_used": self.memory_used,
+        }
+
+    def _get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry[0]
+        return None
+
+    def _put(self, key, value, size):
+        if size > self.memory_budget:
+            return
+        if key in self.entries:
+            self.memory_used -= self.entries.pop(key)[1]
+        self.entries[key] = (value, size)
+        self.memory_used += size
+        while self.memory_used > self.memory_budget:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.memory_used -= evicted_size
+            self.evictions += 1
+
+    def _count_goal(self, goal):
+        # Bounded like the cache itself so a long tail of cold goals
+        # cannot grow the counter table forever.
+        count = self.goal_counts.pop(goal, 0) + 1
+        self.goal_counts[goal] = count
+        if len(self.goal_counts) > 4 * len(self.entries) + 1024:
+            self.goal_counts.popitem(last=False)
+        return count
+
+    def query(self, source, goal):
+        """Return ``(path, distance, expanded)`` like ``csr_a_star``."""
+        with self._lock:
+            tree = self._get(("tree", goal))
+            if tree is None:
+                route = self._get(("route", source, goal))
+                if route is not None:
+                    self.hits += 1
+                    return list(route[0]) if route[0] else None, route[1], 0
+                self.misses += 1
+                build_tree = self._count_goal(goal) >= self.tree_after
+                if build_tree and self.graph.num_nodes * _TREE_NODE_BYTES > self.memory_budget:
+                    build_tree = False
+                    self.goal_counts.pop(goal, None)
+                    self.trees_skipped += 1
+            else:
+                self.hits += 1
+
+        if tree is not None:
+            return walk_tree(tree, source, goal) + (0,)
+
+        if build_tree:
+            tree = shortest_path_tree(self.graph.reversed(), goal)
+            size = sum(len(a) * a.itemsize for a in tree)
+            with self._lock:
+                self._put(("tree", goal), tree, size)
+                self.goal_counts.pop(goal, None)
+            return walk_tree(tree, source, goal) + (self.graph.num_nodes,)
+
+        path, distance, expanded = self.search(self.graph, source, goal)
+        size = _ROUTE_OVERHEAD + 8 * (len(path) if path else 0)
+        with self._lock:
+            self._put(("route", source, goal), (path, distance), size)
+        return path, distance, expanded
+
+
+def walk_tree(tree, source, goal):
+    """Follow a reverse shortest-path tree from ``source`` to its root."""
+    dist, parent = tree
+    if dist[source] == INF:
+        return None, INF
+    path = [source]
+    while path[-1] != goal:
+        path.append(parent[path[-1]])
+    return path, dist[source]
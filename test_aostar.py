@@ -0,0 +1,132 @@
+import random
+
+import pytest
+
+from AOstar import (INF, SOLVED, AndOrGraph, AOStarSolver, aostar, aostar_iterative, graph, heuristic,
+                    solution_path, solve, solve_parallel)
+
+# Reaching A first must not hide the way round the cycle: S -> B -> A -> L costs 0
+CYCLE_GRAPH = {'S': [[('A', 10)], [('B', 0)]], 'A': [[('B', 0)], [('L', 0)]], 'B': [[('A', 0)]]}
+CYCLE_HEURISTIC = {'S': 0, 'A': 0, 'B': 20, 'L': 0}
+
+
+def random_graph(seed, acyclic):
+    """Random AND-OR graph over nodes 0..n-1 with non-negative costs; node 0 is the start."""
+    rng = random.Random(seed)
+    n = rng.randint(2, 25)
+    and_or = {}
+    for u in range(n - 1 if acyclic else n):
+        if rng.random() < 0.65:
+            and_or[u] = [[(rng.randint(u + 1, n - 1) if acyclic else rng.randrange(n), rng.randint(0, 5))
+                          for _ in range(rng.randint(1, 3))]
+                         for _ in range(rng.randint(1, 3))]
+    return and_or, {u: rng.randint(0, 6) for u in range(n)}
+
+
+def fixed_point(and_or, start):
+    """Least fixed point of cost(u) = min over groups, by Bellman-Ford style sweeps from INF."""
+    reached = {start}
+    stack = [start]
+    while stack:
+        for group in and_or.groups(stack.pop()):
+            for child, _ in and_or.group_children(group):
+                if child not in reached:
+                    reached.add(child)
+                    stack.append(child)
+    internal = {u for u in reached if and_or.group_offsets[u] != and_or.group_offsets[u + 1]}
+    cost = {u: INF if u in internal else and_or.heuristics[u] for u in reached}
+    for _ in range(len(reached) + 1):
+        for u in internal:
+            cost[u] = min(and_or.group_cost(group, cost) for group in and_or.groups(u))
+    return cost
+
+
+def test_solvers_agree_on_example():
+    assert aostar_iterative(graph, heuristic) == aostar(graph, heuristic)
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_solvers_agree_on_random_dags(seed):
+    # aostar recurses forever on a cycle, so only acyclic graphs compare
+    and_or, h = random_graph(seed, acyclic=True)
+    if 0 in and_or:
+        assert aostar_iterative(and_or, h, 0) == aostar(and_or, h, 0)
+
+
+def test_cycle_entered_from_inside():
+    and_or = AndOrGraph.from_dict(CYCLE_GRAPH, CYCLE_HEURISTIC)
+    index = and_or.index
+    cost, best_group = solve(and_or, index['S'])
+    assert cost[index['S']] == 0
+    assert cost[index['B']] == 0
+    assert [and_or.names[u] for u in solution_path(and_or, best_group, index['S'])] == ['S', 'B', 'A', 'L']
+
+
+@pytest.mark.parametrize("seed", range(500))
+def test_cyclic_costs_match_fixed_point(seed):
+    and_or = AndOrGraph.from_dict(*random_graph(seed, acyclic=False))
+    start = and_or.index[0]
+    cost, _ = solve(and_or, start)
+    for u, expected in fixed_point(and_or, start).items():
+        assert cost[u] == expected
+
+
+def assert_resolve_agrees(solver):
+    """An incrementally updated solver must match a fresh solve of the same graph."""
+    cost, _ = solve(solver.graph, solver.start)
+    for u in range(solver.graph.num_nodes):
+        if solver.state[u] == SOLVED:
+            assert solver.cost[u] == cost[u]
+
+
+def test_resolve_on_cycle():
+    and_or = AndOrGraph.from_dict(CYCLE_GRAPH, CYCLE_HEURISTIC)
+    index = and_or.index
+    solver = AOStarSolver(and_or, index['S'])
+    updates = [
+        lambda: solver.set_edge_cost(index['A'], 1, index['L'], 7),
+        lambda: solver.set_edge_cost(index['B'], 0, index['A'], 4),
+        lambda: solver.set_heuristic(index['L'], 30),
+        lambda: solver.set_edge_cost(index['A'], 0, index['B'], 1),
+        lambda: solver.set_heuristic(index['L'], 0),
+    ]
+    for update in updates:
+        update()
+        solver.resolve()
+        assert_resolve_agrees(solver)
+
+
+@pytest.mark.parametrize("acyclic", [True, False])
+@pytest.mark.parametrize("seed", range(300))
+def test_resolve_after_random_updates(acyclic, seed):
+    and_or = AndOrGraph.from_dict(*random_graph(seed, acyclic))
+    rng = random.Random(seed)
+    solver = AOStarSolver(and_or, and_or.index[0])
+    internal = [u for u in range(and_or.num_nodes) if and_or.group_offsets[u] != and_or.group_offsets[u + 1]]
+    leaves = [u for u in range(and_or.num_nodes) if u not in internal]
+    for _ in range(8):
+        if internal and (not leaves or rng.random() < 0.7):
+            u = rng.choice(internal)
+            k = rng.randrange(and_or.group_offsets[u + 1] - and_or.group_offsets[u])
+            child, _ = rng.choice(list(and_or.group_children(and_or.group_offsets[u] + k)))
+            solver.set_edge_cost(u, k, child, rng.randint(0, 8))
+        else:
+            solver.set_heuristic(rng.choice(leaves), rng.randint(0, 8))
+        solver.resolve()
+        assert_resolve_agrees(solver)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_prune_and_parallel_match_sequential_on_cycles(seed):
+    and_or = AndOrGraph.from_dict(*random_graph(seed, acyclic=False))
+    start = and_or.index[0]
+    expected, _ = solve(and_or, start)
+    solvers = [AOStarSolver(and_or, start, prune=True)]
+    for width in (2, 3):
+        for prune in (False, True):
+            solvers.append(solve_parallel(and_or, start, processes=3, prune=prune, width=width))
+    for solver in solvers:
+        assert solver.cost[start] == expected[start]
+        for u in range(and_or.num_nodes):
+            if solver.state[u] == SOLVED:
+                assert solver.cost[u] == expected[u]
@@ -0,0 +1,57 @@
+import itertools
+import random
+
+import pytest
+
+from LOCAL_BEAM_SEARCH import best_swaps, best_swaps_numpy, calculate_distance, local_beam_search
+
+np = pytest.importorskip("numpy")
+
+
+def random_instance(num_cities, k, seed, float_matrix):
+    rng = random.Random(seed)
+    draw = (lambda: rng.uniform(1, 100)) if float_matrix else (lambda: rng.randint(1, 100))
+    matrix = [[0 if i == j else draw() for j in range(num_cities)] for i in range(num_cities)]
+    cities = list(range(num_cities))
+    beam = [tuple(rng.sample(cities, num_cities)) for _ in range(k)]
+    return matrix, beam
+
+
+@pytest.mark.parametrize("float_matrix", [False, True])
+@pytest.mark.parametrize("num_cities", [2, 3, 4, 12])
+@pytest.mark.parametrize("seed", range(20))
+def test_backends_pick_the_same_swaps(float_matrix, num_cities, seed):
+    k = 4
+    matrix, beam = random_instance(num_cities, k, seed, float_matrix)
+    distances = [calculate_distance(route, matrix) for route in beam]
+    beam_array, distance_array = np.array(beam), np.array(distances)
+    for _ in range(20):
+        scored = best_swaps(beam, distances, k, matrix)
+        distances = [distance for distance, _ in scored]
+        beam = [route for _, route in scored]
+        distance_array, beam_array = best_swaps_numpy(beam_array, distance_array, k, matrix)
+        assert beam_array.tolist() == [list(route) for route in beam]
+        assert distance_array.tolist() == distances
+
+
+@pytest.mark.parametrize("float_matrix, distinct, tabu_size",
+                         [combo for combo in itertools.product([False, True], [False, True], [0, 5])
+                          if combo[1] or combo[2]])
+@pytest.mark.parametrize("seed", range(20))
+def test_backends_agree_through_select_distinct(float_matrix, distinct, tabu_size, seed):
+    k = 4
+    matrix, beam = random_instance(12, k, seed, float_matrix)
+    runs = []
+    for backend in ("python", "numpy"):
+        trace = []
+        route, iteration = local_beam_search(k, list(beam), matrix, 20, backend, distinct, tabu_size,
+                                             trace=trace)
+        runs.append((route, iteration, [(it, distance) for it, _, distance in trace]))
+    assert runs[0] == runs[1]
+
+
+def test_numpy_backend_without_swaps():
+    distances, beam = best_swaps_numpy([(0,)], [0.0], 3, [[0]])
+    assert distances.size == 0 and beam.shape == (0, 1)
+    distances, beam = best_swaps_numpy([(0, 1, 2)], [3], 0, np.ones((3, 3)))
+    assert distances.size == 0